@@ -3,6 +3,11 @@
 Python EDL parsing library
 """
 
-from edl import EDL, Parser
+from edl import EDL, LazyEDL, Parser
+from filters import EventFilter
+from symbols import SymbolTable
+from usage import SourceUsageIndex
+from timeline import Timeline
+from conform import Catalog
 
-__version__ = '0.1.12'
+__version__ = '0.2.0'
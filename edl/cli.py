@@ -0,0 +1,445 @@
+"""Command line interface, run it with ``python -m edl``::
+
+  python -m edl stats --fps 24 edls/
+  python -m edl validate 'edls/*/reel_*.edl'
+  python -m edl convert --fps 25 --to-fps 24 -o converted/ reel1.edl
+  python -m edl export --format jsonl -o events.jsonl edls/
+  python -m edl capture-list --handles 12 conform.edl
+
+Directories are searched recursively for ``*.edl`` files and glob patterns
+are expanded, so the tool also works with shells that do not expand them.
+Recursive ``**`` patterns are not supported by :mod:`glob` on Python 2,
+pass the directory itself to process a whole tree.
+Files are processed on a pool of worker processes when there are more than
+one of them, and a throughput summary is written to stderr.
+
+Only the modules needed to parse EDLs are imported at startup, everything
+else is imported lazily by the sub commands that need it, so the tool stays
+cheap to start in shell loops.
+"""
+from __future__ import print_function
+
+import os
+import sys
+
+
+EXPORT_FIELDS = ['file', 'num', 'reel', 'track', 'tr_code', 'aux',
+                 'src_start_tc', 'src_end_tc', 'rec_start_tc', 'rec_end_tc',
+                 'src_length', 'rec_length', 'clip_name', 'source_file']
+
+
+def find_edls(paths):
+    """Expands the given files, directories and glob patterns to a sorted list
+    of EDL file paths.
+    """
+    import glob
+
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith('.edl'):
+                        found.append(os.path.join(root, name))
+        elif os.path.exists(path):
+            found.append(path)
+        elif glob.has_magic(path):
+            found.extend(p for p in sorted(glob.glob(path))
+                         if os.path.isfile(p))
+        else:
+            raise IOError('No such file or directory: %s' % path)
+    return found
+
+
+def common_dir(paths):
+    """Returns the deepest directory containing all the given paths.
+    """
+    common = None
+    for path in paths:
+        parts = os.path.dirname(os.path.abspath(path)).split(os.sep)
+        if common is None:
+            common = parts
+            continue
+        i = 0
+        while i < min(len(common), len(parts)) and common[i] == parts[i]:
+            i += 1
+        common = common[:i]
+    return os.sep.join(common or ['']) or os.sep
+
+
+def _parse_file(path, fps):
+    from .edl import Parser
+
+    with open(path) as f:
+        lines = f.readlines()
+    return Parser(fps).parse(lines), len(lines)
+
+
+def _frames_to_tc(fps, frames):
+    import timecode
+    return str(timecode.Timecode(fps, frames=max(frames, 1)))
+
+
+def stats(edl):
+    """Returns the statistics of the given EDL as a dictionary.
+    """
+    tracks = set()
+    reels = set()
+    for e in edl.events:
+        tracks.add(e.track)
+        reels.add(e.reel)
+    length = edl.get_length() if len(edl) else 0
+    return {
+        'title': edl.title,
+        'events': len(edl),
+        'tracks': sorted(tracks),
+        'reels': len(reels),
+        'length': length,
+        'duration': _frames_to_tc(edl.fps, length + 1),
+    }
+
+
+def validate(edl):
+    """Returns a list of problem descriptions found in the given EDL.
+    """
+    problems = []
+    if not len(edl):
+        problems.append('no events')
+    for e in edl.events:
+        if e.transition is None:
+            problems.append('event %s: unknown transition code %r'
+                            % (e.num, e.tr_code))
+        if e.src_length() < 0:
+            problems.append('event %s: source out before source in'
+                            % e.num)
+        if e.rec_length() < 0:
+            problems.append('event %s: record out before record in'
+                            % e.num)
+        elif not e.has_timewarp() and e.src_length() != e.rec_length():
+            problems.append('event %s: source length %d does not match '
+                            'record length %d'
+                            % (e.num, e.src_length(), e.rec_length()))
+    return problems
+
+
+def _nominal_rate(fps):
+    import timecode
+    return int(round(float(timecode.Timecode(fps).framerate)))
+
+
+def _convert_tc(tc, fps):
+    import timecode
+
+    src_rate = int(round(float(tc.framerate)))
+    converted = timecode.Timecode(fps)
+    dst_rate = int(round(float(converted.framerate)))
+    frames = int(round((tc.frames - 1) * dst_rate / float(src_rate))) + 1
+    converted.frames = frames
+    return converted
+
+
+def convert(edl, fps):
+    """Returns a copy of the given EDL re-timed to the given fps.
+
+    Timecodes, transition durations and timewarp speeds are converted over
+    their nominal frame rates, so converting between rates sharing the same
+    nominal rate (23.98 and 24, or drop and non drop 29.97) only changes the
+    timecode representation.
+    """
+    import copy
+    from .edl import EDL
+
+    scale = _nominal_rate(fps) / float(_nominal_rate(edl.fps))
+    converted = EDL(fps)
+    converted.title = edl.title
+    for e in edl.events:
+        c = copy.copy(e)
+        # linked to the converted events by resolve_transitions() below
+        c.transition_table = None
+        c.prev_event = c.next_event = None
+        for attr in ('src_start_tc', 'src_end_tc', 'rec_start_tc',
+                     'rec_end_tc'):
+            setattr(c, attr, _convert_tc(getattr(e, attr), fps))
+        if e.aux and e.aux.isdigit():
+            c.aux = '%0*d' % (len(e.aux), int(round(int(e.aux) * scale)))
+        if e.timewarp is not None:
+            c.timewarp = copy.copy(e.timewarp)
+            c.timewarp.fps = fps
+            c.timewarp.warp_fps = e.timewarp.warp_fps * scale
+            c.timewarp.timecode = _convert_tc(e.timewarp.timecode, fps)
+        converted.append(c)
+    converted.resolve_transitions()
+    return converted
+
+
+def export_rows(edl, path):
+    """Returns a list of dictionaries, one per event, with the
+    :data:`EXPORT_FIELDS` keys.
+    """
+    rows = []
+    for e in edl.events:
+        rows.append({
+            'file': path,
+            'num': e.num,
+            'reel': e.reel,
+            'track': e.track,
+            'tr_code': e.tr_code,
+            'aux': e.aux,
+            'src_start_tc': str(e.src_start_tc),
+            'src_end_tc': str(e.src_end_tc),
+            'rec_start_tc': str(e.rec_start_tc),
+            'rec_end_tc': str(e.rec_end_tc),
+            'src_length': e.src_length(),
+            'rec_length': e.rec_length(),
+            'clip_name': e.clip_name,
+            'source_file': e.source_file,
+        })
+    return rows
+
+
+def capture_list(edl, handles=0):
+    """Returns the source ranges to capture for the given EDL as a list of
+    ``(reel, start_frame, end_frame)`` tuples.
+
+    Ranges of the same reel that overlap or touch once the handles are added
+    are merged. Black slugs are skipped.
+    """
+    ranges = {}
+    for e in edl.events:
+        if e.black() or e.src_length() <= 0:
+            continue
+        ranges.setdefault(e.reel, []).append(
+            (max(e.src_start_tc.frames - handles, 1),
+             e.src_end_tc.frames + handles))
+
+    captures = []
+    for reel in sorted(ranges):
+        current = None
+        for start, end in sorted(ranges[reel]):
+            if current is not None and start <= current[1]:
+                current[1] = max(current[1], end)
+                continue
+            if current is not None:
+                captures.append((reel, current[0], current[1]))
+            current = [start, end]
+        captures.append((reel, current[0], current[1]))
+    return captures
+
+
+def _work(task):
+    """Processes a single file in a worker process.
+
+    Returns a ``(path, lines, events, result, error)`` tuple, the result
+    depends on the command.
+    """
+    command, path, options = task
+    try:
+        edl, lines = _parse_file(path, options['fps'])
+        if command == 'stats':
+            result = stats(edl)
+        elif command == 'validate':
+            result = validate(edl)
+        elif command == 'convert':
+            result = convert(edl, options['to_fps']).to_string()
+        elif command == 'export':
+            result = export_rows(edl, path)
+        elif command == 'capture-list':
+            result = [(reel, _frames_to_tc(edl.fps, start),
+                       _frames_to_tc(edl.fps, end), end - start)
+                      for reel, start, end in
+                      capture_list(edl, options['handles'])]
+        else:
+            raise ValueError('Unknown command: %s' % command)
+        return path, lines, len(edl), result, None
+    except Exception as e:
+        return path, 0, 0, None, '%s: %s' % (e.__class__.__name__, e)
+
+
+def _run(command, paths, options, jobs):
+    """Yields the results of the given command for each path, in order.
+    """
+    tasks = [(command, path, options) for path in paths]
+    if jobs == 1 or len(tasks) < 2:
+        for task in tasks:
+            yield _work(task)
+        return
+
+    import multiprocessing
+
+    pool = multiprocessing.Pool(min(jobs, len(tasks)))
+    try:
+        chunksize = max(1, len(tasks) // (jobs * 8))
+        for result in pool.imap(_work, tasks, chunksize):
+            yield result
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+class _Writer(object):
+    """Writes the results of each command to the output.
+    """
+
+    def __init__(self, args, out):
+        self.args = args
+        self.out = out
+        self.failures = 0
+        self._csv = None
+        #: the directory the converted EDLs are written relative to
+        self.root = None
+
+    def write(self, path, result):
+        getattr(self, 'write_' + self.args.command.replace('-', '_'))(
+            path, result)
+
+    def write_stats(self, path, result):
+        print('%s\t%d events\t%d reels\ttracks %s\tlength %d (%s)\t%s'
+              % (path, result['events'], result['reels'],
+                 ','.join(result['tracks']), result['length'],
+                 result['duration'], result['title']), file=self.out)
+
+    def write_validate(self, path, result):
+        if result:
+            self.failures += 1
+            for problem in result:
+                print('%s: %s' % (path, problem), file=self.out)
+        elif not self.args.quiet:
+            print('%s: OK' % path, file=self.out)
+
+    def write_convert(self, path, result):
+        if self.args.output is None:
+            self.out.write(result)
+            return
+        # keep the layout of the input tree so EDLs with the same name in
+        # different directories do not overwrite each other
+        output = os.path.join(self.args.output,
+                              os.path.relpath(os.path.abspath(path),
+                                              self.root))
+        if not os.path.isdir(os.path.dirname(output)):
+            os.makedirs(os.path.dirname(output))
+        with open(output, 'w') as f:
+            f.write(result)
+
+    def write_export(self, path, result):
+        if self.args.format == 'jsonl':
+            import json
+            for row in result:
+                self.out.write(json.dumps(row, sort_keys=True) + '\n')
+            return
+        if self._csv is None:
+            import csv
+            self._csv = csv.DictWriter(self.out, EXPORT_FIELDS,
+                                       lineterminator='\n')
+            self._csv.writeheader()
+        self._csv.writerows(result)
+
+    def write_capture_list(self, path, result):
+        for reel, start, end, frames in result:
+            print('%s\t%s\t%s\t%s\t%d' % (path, reel, start, end, frames),
+                  file=self.out)
+
+
+def build_parser():
+    """Returns the :class:`argparse.ArgumentParser` of the tool.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='python -m edl',
+        description='Batch statistics, validation and conversion of EDLs.')
+    sub_parsers = parser.add_subparsers(dest='command')
+
+    def add_command(name, help_):
+        p = sub_parsers.add_parser(name, help=help_)
+        p.add_argument('paths', nargs='+', metavar='PATH',
+                       help='EDL files, directories or glob patterns')
+        p.add_argument('--fps', default=None,
+                       help='frame rate of the EDLs (default: 25)')
+        p.add_argument('-j', '--jobs', type=int, default=0,
+                       help='number of worker processes (default: one per '
+                            'core)')
+        p.add_argument('-q', '--quiet', action='store_true',
+                       help='do not report throughput nor the files '
+                            'passing validation')
+        return p
+
+    add_command('stats', 'print event counts and durations')
+    add_command('validate', 'check EDLs for inconsistent events')
+    p = add_command('convert', 'convert EDLs to another frame rate')
+    p.add_argument('--to-fps', required=True,
+                   help='frame rate of the converted EDLs')
+    p.add_argument('-o', '--output', default=None, metavar='DIR',
+                   help='directory to write the converted EDLs to '
+                        '(default: stdout)')
+    p = add_command('export', 'export events as CSV or JSON lines')
+    p.add_argument('--format', choices=['csv', 'jsonl'], default='csv')
+    p.add_argument('-o', '--output', default=None, metavar='FILE',
+                   help='file to write to (default: stdout)')
+    p = add_command('capture-list', 'list the source ranges to capture')
+    p.add_argument('--handles', type=int, default=0,
+                   help='handle frames added on both sides of each range')
+    return parser
+
+
+def main(argv=None):
+    """Runs the tool with the given arguments and returns its exit status.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.error('a command is required')
+
+    import time
+    from .edl import Parser
+
+    start = time.time()
+    try:
+        paths = find_edls(args.paths)
+    except IOError as e:
+        sys.stderr.write('%s\n' % e)
+        return 2
+
+    jobs = args.jobs
+    if jobs <= 0:
+        import multiprocessing
+        jobs = multiprocessing.cpu_count()
+
+    options = {
+        'fps': args.fps or Parser.default_fps,
+        'to_fps': getattr(args, 'to_fps', None),
+        'handles': getattr(args, 'handles', 0),
+    }
+
+    out = sys.stdout
+    if args.command == 'export' and args.output is not None:
+        out = open(args.output, 'w')
+
+    writer = _Writer(args, out)
+    writer.root = common_dir(paths)
+    errors = lines = events = 0
+    try:
+        for path, n_lines, n_events, result, error in \
+                _run(args.command, paths, options, jobs):
+            if error is not None:
+                errors += 1
+                sys.stderr.write('%s: %s\n' % (path, error))
+                continue
+            lines += n_lines
+            events += n_events
+            writer.write(path, result)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if not args.quiet:
+        elapsed = max(time.time() - start, 1e-6)
+        sys.stderr.write(
+            '%d files, %d lines, %d events in %.3fs '
+            '(%.1f files/s, %.0f lines/s, %.0f events/s, %d jobs)\n'
+            % (len(paths), lines, events, elapsed, len(paths) / elapsed,
+               lines / elapsed, events / elapsed, min(jobs, len(paths))))
+
+    if errors or writer.failures:
+        return 1
+    return 0
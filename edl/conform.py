@@ -0,0 +1,235 @@
+import bisect
+import collections
+import csv
+import time
+
+import timecode
+
+
+def _fps_value(fps):
+    """Returns the given frame rate as a float rounded to 2 decimals, so
+    '23.976', '23.98' and '24000/1001' compare equal.
+    """
+    fps = str(fps)
+    if '/' in fps:
+        numerator, denominator = fps.split('/')
+        return round(float(numerator) / float(denominator), 2)
+    return round(float(fps), 2)
+
+
+def _nominal_rate(fps):
+    """Returns the number of timecode frames per second of the given frame
+    rate, 24 for 23.98, 30 for 29.97 ...
+    """
+    return int(round(_fps_value(fps)))
+
+
+class MediaFile(collections.namedtuple('MediaFile',
+                                       ['name', 'reel', 'start', 'length',
+                                        'fps'])):
+    """A media file of a :class:`Catalog`, ``start`` is the frame number of
+    its first frame (86400 for 01:00:00:00 at 24 fps) and ``length`` its
+    number of frames, both at its own ``fps``.
+    """
+    __slots__ = ()
+
+    @property
+    def end(self):
+        return self.start + self.length
+
+
+class ConformMatch(collections.namedtuple('ConformMatch',
+                                          ['index', 'event', 'media', 'key',
+                                           'coverage', 'fps_mismatch'])):
+    """The media resolved for the event at ``index`` of an EDL.
+
+    ``media`` is the matching :class:`MediaFile` or None, ``key`` the event
+    attribute it was found with (``'source_file'``, ``'clip_name'`` or
+    ``'reel'``) and ``coverage`` the number of source frames of the event
+    the media holds.
+    """
+    __slots__ = ()
+
+    @property
+    def status(self):
+        """'full', 'partial' or 'missing'.
+        """
+        if self.media is None:
+            return 'missing'
+        if self.coverage < self.event.src_length():
+            return 'partial'
+        return 'full'
+
+
+class _Intervals(object):
+    """The media of one name or reel sorted by start time, with the running
+    maximum of their end times so the media overlapping a range are found
+    with a bisection and a scan over the overlapping media only.
+    """
+
+    def __init__(self, media):
+        # (start, end, media, nominal rate, fps value) with the start and end
+        # in seconds, converted once
+        self.entries = []
+        for m in media:
+            rate = _nominal_rate(m.fps)
+            self.entries.append((m.start / float(rate), m.end / float(rate),
+                                 m, rate, _fps_value(m.fps)))
+        self.entries.sort(key=lambda entry: entry[0])
+        self.starts = [entry[0] for entry in self.entries]
+        self.max_ends = []
+        max_end = None
+        for entry in self.entries:
+            max_end = entry[1] if max_end is None else max(max_end, entry[1])
+            self.max_ends.append(max_end)
+
+    def overlapping(self, start, end):
+        """Yields the entries of the media overlapping the ``[start, end)``
+        seconds range, latest start first.
+        """
+        i = bisect.bisect_left(self.starts, end) - 1
+        while i >= 0 and self.max_ends[i] > start:
+            if self.entries[i][1] > start:
+                yield self.entries[i]
+            i -= 1
+
+
+class Catalog(object):
+    """A catalog of media files to conform EDLs against.
+
+    The media are indexed by name and by reel once, then :meth:`conform`
+    resolves all the events of an EDL in bulk::
+
+      >>> catalog = Catalog.from_csv('media.csv')
+      >>> report = catalog.conform(Parser('24').parse(f))
+      >>> report.summary()
+      {'events': 1200, 'full': 1180, 'partial': 12, 'missing': 8,
+       'fps_mismatch': 3}
+
+    :param media: An iterable of :class:`MediaFile`, of ``(name, reel,
+      start, length, fps)`` tuples or of dictionaries with those keys.
+    """
+
+    def __init__(self, media=()):
+        by_name = {}
+        by_reel = {}
+        count = 0
+        for m in media:
+            if isinstance(m, dict):
+                m = MediaFile(**m)
+            elif not isinstance(m, MediaFile):
+                m = MediaFile(*m)
+            count += 1
+            by_name.setdefault(m.name, []).append(m)
+            if m.reel:
+                by_reel.setdefault(m.reel, []).append(m)
+        self._len = count
+        self._by_name = dict((k, _Intervals(v)) for k, v in by_name.items())
+        self._by_reel = dict((k, _Intervals(v)) for k, v in by_reel.items())
+
+    def __len__(self):
+        return self._len
+
+    @classmethod
+    def from_csv(cls, path):
+        """Reads a catalog from a CSV file with ``name``, ``reel``, ``start``,
+        ``length`` and ``fps`` columns. ``start`` can be a frame number or a
+        timecode.
+        """
+        def read(f):
+            for row in csv.DictReader(f):
+                fps = row['fps']
+                start = row['start']
+                if ':' in start or ';' in start:
+                    start = timecode.Timecode(fps, start).frame_number
+                else:
+                    start = int(start)
+                yield MediaFile(row['name'], row['reel'] or None, start,
+                                int(row['length']), fps)
+
+        with open(path) as f:
+            return cls(read(f))
+
+    def conform(self, edl):
+        """Resolves every event of the given :class:`.EDL` to the media
+        holding its source range and returns a :class:`ConformReport`.
+
+        Events are looked up by ``source_file``, then ``clip_name``, then
+        ``reel``. For each lookup the media overlapping most of the source
+        range of the event wins. Black slugs are not resolved.
+        """
+        started = time.time()
+        rate = float(_nominal_rate(edl.fps))
+        edl_fps = _fps_value(edl.fps)
+        lookups = (('source_file', self._by_name),
+                   ('clip_name', self._by_name),
+                   ('reel', self._by_reel))
+        matches = []
+        for index, e in enumerate(edl):
+            if e.black():
+                continue
+            start = e.src_start_tc.frame_number
+            end = start + e.src_length()
+            best = None
+            for key, table in lookups:
+                intervals = table.get(getattr(e, key))
+                if intervals is None:
+                    continue
+                for entry in intervals.overlapping(start / rate, end / rate):
+                    m = entry[2]
+                    scale = entry[3] / rate
+                    coverage = max(
+                        min(end, int(round(m.end / scale))) -
+                        max(start, int(round(m.start / scale))), 0)
+                    if best is None or coverage > best[1]:
+                        best = (entry, coverage)
+                if best is not None:
+                    break
+            if best is None:
+                matches.append(ConformMatch(index, e, None, None, 0, False))
+            else:
+                entry, coverage = best
+                matches.append(ConformMatch(index, e, entry[2], key, coverage,
+                                            entry[4] != edl_fps))
+        return ConformReport(matches, time.time() - started)
+
+
+class ConformReport(object):
+    """The result of :meth:`Catalog.conform`, holds a :class:`ConformMatch`
+    per resolved event in ``matches``.
+    """
+
+    def __init__(self, matches, elapsed=0.0):
+        self.matches = matches
+        #: the time spent resolving the events, in seconds
+        self.elapsed = elapsed
+
+    def __len__(self):
+        return len(self.matches)
+
+    def __iter__(self):
+        return iter(self.matches)
+
+    def full(self):
+        return [m for m in self.matches if m.status == 'full']
+
+    def partial(self):
+        return [m for m in self.matches if m.status == 'partial']
+
+    def missing(self):
+        return [m for m in self.matches if m.media is None]
+
+    def fps_mismatches(self):
+        return [m for m in self.matches if m.fps_mismatch]
+
+    def summary(self):
+        """Returns the number of events for each status as a dictionary.
+        """
+        counts = collections.Counter(m.status for m in self.matches)
+        return {
+            'events': len(self.matches),
+            'full': counts['full'],
+            'partial': counts['partial'],
+            'missing': counts['missing'],
+            'fps_mismatch': len(self.fps_mismatches()),
+        }
@@ -1,6 +1,14 @@
+import array
 import collections
+import copy
 import pprint
+import re
+import timecode
+from .effects import transition_for
 from .event import Event
+from .filters import EventFilter
+from .symbols import SymbolTable
+from .transitions import Transitions
 from .matchers import TitleMatcher, EventMatcher, EffectMatcher, NameMatcher, \
     SourceMatcher, TimewarpMatcher, CommentMatcher
 
@@ -25,12 +33,28 @@ class EDL(object):
         self.events = []
         self.fps = fps
         self.title = ''
+        # the SymbolTable holding the strings shared by the events
+        self.symbols = None
+        self.transitions = None
 
     def __getitem__(self, i):
         """Returns each of the Events that this EDL holds.
         """
         return self.events[i]
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # the events are pickled without their links, they are resolved
+        # again by __setstate__
+        state['transitions'] = self.transitions is not None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        resolved, self.transitions = self.transitions, None
+        if resolved:
+            self.resolve_transitions()
+
     # def __repr__(self):
     #     rep = ["event(\n"]
     #     for e in self.events:
@@ -65,8 +89,28 @@ class EDL(object):
         return self.get_end().frames - self.get_start().frames
 
     def append(self, evt):
+        """Adds the given event at the end of the EDL.
+
+        The links and transitions resolved for the event, by this or another
+        EDL, are dropped and so are the ones of the other events if the EDL
+        was resolved. Call :meth:`resolve_transitions` once the events are
+        added.
+        """
+        if self.transitions is not None:
+            for e in self.events:
+                e._unlink()
+            self.transitions = None
+        evt._unlink()
         self.events.append(evt)
 
+    def resolve_transitions(self):
+        """Links each event to its neighbours on the same track and computes
+        the transitions between them, see :class:`.Transitions`. Should be
+        called again after the events are changed.
+        """
+        self.transitions = Transitions(self.events)
+        return self.transitions
+
     def events(self):
         return self.events
 
@@ -104,37 +148,484 @@ class EDL(object):
         return '\n'.join(output_buffer)
 
 
+class ReadOnlyEDL(EDL):
+    """Base of the :class:`.EDL` views that build their events on demand
+    instead of holding them in a list, like :class:`.LazyEDL` and
+    :class:`.SharedEDL`.
+
+    Sub classes implement :meth:`__len__` and :meth:`_event`. As the events
+    are built independently, their transitions are not resolved and their
+    ``prev_event`` and ``next_event`` attributes are not set.
+    """
+
+    def __init__(self, fps, title=''):
+        # events are not stored in a list, see the events property
+        self.fps = fps
+        self.title = title
+        self.symbols = None
+        self.transitions = None
+
+    def _check(self, i):
+        """Returns the given event index made positive, raises an IndexError
+        if it is out of range.
+        """
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('event index out of range')
+        return i
+
+    def _event(self, i):
+        """Returns the Event at the given positive index.
+        """
+        raise NotImplementedError
+
+    def __getitem__(self, i):
+        """Returns the Event at the given index, or a list of Events for a
+        slice.
+        """
+        if isinstance(i, slice):
+            return [self._event(j) for j in range(*i.indices(len(self)))]
+        return self._event(self._check(i))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._event(i)
+
+    @property
+    def events(self):
+        """All the Events as a list.
+        """
+        return list(self)
+
+    def append(self, evt):
+        raise TypeError('%s is read only' % self.__class__.__name__)
+
+
+# the timecodes of an event sent back by the workers of parse_parallel() as
+# frame numbers
+_PACKED_TIMECODES = ('src_start_tc', 'src_end_tc', 'rec_start_tc',
+                     'rec_end_tc')
+# the private attributes of a _PackedEvent
+_PACKED_KEYS = ('_fps', '_frames', '_frames_offset')
+
+
+def _parse_chunk(task):
+    """Parses a chunk of lines in a worker process of
+    :meth:`.Parser.parse_parallel`.
+
+    Returns the title of the chunk, the frame numbers of the timecodes of its
+    events in a flat array and a tuple of the other values per event, which
+    are a lot cheaper to send back than the events themselves.
+    """
+    fps, event_filter, lines = task
+    parser = Parser(fps, event_filter)
+    stack = EDL(fps)
+    parser._start(stack, SymbolTable())
+    parser._apply(stack, lines)
+
+    frames = array.array('l')
+    rows = []
+    for e in stack.events:
+        for key in _PACKED_TIMECODES:
+            frames.append(getattr(e, key).frames)
+        rows.append((e.num, e.reel, e.track, e.tr_code, e.aux, e.clip_name,
+                     e.source_file, getattr(e.transition, 'effect', None),
+                     e.comments, e.metadata, e.timewarp))
+    return stack.title, frames, rows
+
+
+class _PackedTimecode(object):
+    """Builds a timecode of a :class:`_PackedEvent` from its frame number
+    when it is first read, then stores it on the event.
+    """
+
+    def __init__(self, name, column):
+        self.name = name
+        self.column = column
+
+    def __get__(self, evt, owner):
+        if evt is None:
+            return self
+        tc = timecode.Timecode(evt._fps, frames=evt._frames[
+            evt._frames_offset + self.column])
+        evt.__dict__[self.name] = tc
+        return tc
+
+
+class _PackedEvent(Event):
+    """An :class:`.Event` returned by :meth:`.Parser.parse_parallel`, built
+    from the values sent back by the workers. Its timecodes are only created
+    when they are read.
+    """
+
+    def _materialize(self):
+        for key in _PACKED_TIMECODES:
+            getattr(self, key)
+
+    def copy_properties_to(self, event):
+        self._materialize()
+        for k in self.__dict__:
+            if k not in _PACKED_KEYS:
+                event.__dict__[k] = self.__dict__[k]
+        return event
+
+    def __reduce__(self):
+        """Pickled and copied as a plain :class:`.Event`, without the frames
+        of the whole chunk.
+        """
+        self._materialize()
+        state = self.__getstate__()
+        for k in _PACKED_KEYS:
+            del state[k]
+        return _plain_event, (state,)
+
+
+def _plain_event(state):
+    """Unpickles a :class:`_PackedEvent` as an :class:`.Event`.
+    """
+    evt = Event.__new__(Event)
+    evt.__dict__.update(state)
+    return evt
+
+
+for _column, _key in enumerate(_PACKED_TIMECODES):
+    setattr(_PackedEvent, _key, _PackedTimecode(_key, _column))
+
+# the attributes of a new Event, except the packed timecodes
+_EVENT_DEFAULTS = dict((k, v) for k, v in Event({}).__dict__.items()
+                       if k not in _PACKED_TIMECODES)
+
+
+def _unpack_chunk(stack, frames, rows):
+    """Appends the events packed by :func:`_parse_chunk` to the given stack,
+    interning their strings through its :class:`.SymbolTable`.
+    """
+    intern = stack.symbols.intern
+    fps = stack.fps
+    offset = 0
+    for (num, reel, track, tr_code, aux, clip_name, source_file, effect,
+         comments, metadata, timewarp) in rows:
+        evt = _PackedEvent.__new__(_PackedEvent)
+        values = dict(_EVENT_DEFAULTS)
+        values['num'] = num
+        values['reel'] = intern(reel)
+        values['track'] = intern(track)
+        values['tr_code'] = intern(tr_code)
+        values['aux'] = intern(aux)
+        values['clip_name'] = intern(clip_name)
+        values['source_file'] = intern(source_file)
+        values['comments'] = tuple(intern(c) for c in comments)
+        values['metadata'] = tuple((intern(k), intern(v))
+                                   for k, v in metadata)
+        if timewarp is not None:
+            timewarp.reel = intern(timewarp.reel)
+            values['timewarp'] = timewarp
+        transition = transition_for(tr_code)
+        if effect is not None:
+            transition.effect = intern(effect)
+        values['transition'] = transition
+        values['_fps'] = fps
+        values['_frames'] = frames
+        values['_frames_offset'] = offset
+        evt.__dict__ = values
+        stack.append(evt)
+        offset += len(_PACKED_TIMECODES)
+
+
+class LazyEDL(ReadOnlyEDL):
+    """An :class:`.EDL` that parses its events on demand.
+
+    Created by :meth:`.Parser.parse_lazy`. The lines are scanned once to
+    record where each event starts and ends and to read the title, so
+    ``len()`` and :attr:`title` are available right away. An
+    :class:`.Event` is only built when it is reached through indexing,
+    slicing or iteration, and the last ``cache_size`` built events are kept
+    in an LRU cache, nothing is cached when ``cache_size`` is 0::
+
+      >>> l = Parser('24').parse_lazy(open('archive.edl'))
+      >>> len(l)
+      120000
+      >>> l[40000].clip_name
+      'clip 40001'
+
+    When read from a seekable file only the byte offsets of the events are
+    kept and the lines of an event are read back from the file when it is
+    built, so the file has to stay open while the events are reached.
+    """
+
+    def __init__(self, parser, lines, cache_size=1024, file_=None):
+        ReadOnlyEDL.__init__(self, parser.fps)
+        self.cache_size = cache_size
+        self._parser = parser
+        # either the lines, or a seekable file the event spans are byte
+        # offsets in
+        self._lines = lines
+        self._file = file_
+        self._starts = array.array('l')
+        self._ends = array.array('l')
+        self._cache = collections.OrderedDict()
+
+    def _scan(self):
+        """Yields the position of each line with the line, then the end
+        position with None.
+        """
+        if self._file is None:
+            for i, l in enumerate(self._lines):
+                yield i, l
+            yield len(self._lines), None
+            return
+        f = self._file
+        position = f.tell()
+        # readline() and not iteration, which reads ahead and breaks tell()
+        l = f.readline()
+        while l:
+            yield position, l
+            position = f.tell()
+            l = f.readline()
+        yield position, None
+
+    def _read(self, i):
+        """Returns the lines of the event at the given index.
+        """
+        if self._file is None:
+            return self._lines[self._starts[i]:self._ends[i]]
+        self._file.seek(self._starts[i])
+        return self._file.read(self._ends[i] - self._starts[i]) \
+            .splitlines(True)
+
+    def index(self):
+        """Records the span of each event and reads the title.
+        """
+        title_matcher = TitleMatcher()
+        event_matcher = self._parser._event_matcher
+        event_filter = event_matcher.event_filter
+        skipping = True
+        for i, l in self._scan():
+            if l is None:
+                break
+            l = l.rstrip('\n')
+            if not l or title_matcher.apply(self, l):
+                continue
+            fields = event_matcher.split(l)
+            if fields is None:
+                continue
+            if not skipping:
+                self._ends.append(i)
+            skipping = event_filter is not None and \
+                not event_filter.accepts(fields)
+            if not skipping:
+                self._starts.append(i)
+        if not skipping:
+            self._ends.append(i)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def _event(self, i):
+        """Returns the Event at the given index, parsing it if it is not in
+        the cache.
+        """
+        if self.cache_size <= 0:
+            return self._materialize(i)
+        try:
+            evt = self._cache.pop(i)
+        except KeyError:
+            evt = self._materialize(i)
+            if len(self._cache) >= self.cache_size:
+                self._cache.popitem(last=False)
+        self._cache[i] = evt
+        return evt
+
+    def _materialize(self, i):
+        stack = EDL(self.fps)
+        self._parser._start(stack, self.symbols)
+        self._parser._apply(stack, self._read(i))
+        return stack[0]
+
+
 class Parser(object):
     """No documentation for this class yet.
+
+    :param str fps: The frame per second setting of the parsed EDLs, defaults
+      to :attr:`.default_fps`.
+    :param filter: An :class:`.EventFilter` or a callable accepted as its
+      ``predicate``. Events rejected by it are skipped while parsing, with
+      their comment and timewarp lines, without creating any objects.
+    :param symbols: A :class:`.SymbolTable` to intern the repeated strings
+      of the events with. When skipped every parsed EDL gets its own table,
+      pass the same table to share the strings between EDLs.
     """
 
     default_fps = "25.0"
 
-    def __init__(self, fps=None):
+    def __init__(self, fps=None, filter=None, symbols=None):
         if fps is None:
             self.fps = self.default_fps
         else:
             self.fps = fps
 
+        if filter is not None and not isinstance(filter, EventFilter):
+            filter = EventFilter(predicate=filter)
+        if filter is not None:
+            # bound on a copy, the same filter can be given to parsers of
+            # other frame rates
+            filter = copy.copy(filter).bind(self.fps)
+        self.filter = filter
+        self.symbols = symbols
+
+        self._event_matcher = EventMatcher(self.fps, self.filter)
         self._matchers = [TitleMatcher(),
-                          EventMatcher(self.fps),
+                          self._event_matcher,
                           EffectMatcher(),
                           NameMatcher(),
                           SourceMatcher(),
                           TimewarpMatcher(self.fps),
                           CommentMatcher()]
 
+    def _symbol_table(self):
+        if self.symbols is None:
+            return SymbolTable()
+        return self.symbols
+
+    def _start(self, stack, symbols):
+        """Prepares the matchers for parsing into the given stack.
+        """
+        stack.symbols = symbols
+        for m in self._matchers:
+            m.symbols = symbols
+        self._event_matcher.skipping = False
+
+    def _apply(self, stack, lines):
+        """Feeds the given lines to the matchers.
+        """
+        for l in lines:
+            l = l.rstrip('\n')  # Remove trailing newlines, usu. from files
+            if l:  # Only spend cycles on lines with data
+                for m in self._matchers:
+                    if m.apply(stack, l):
+                        break
+                    if m is self._event_matcher and m.skipping:
+                        # belongs to a filtered out event
+                        break
+
     def parse(self, input_):
         stack = None
         if isinstance(input_, str):
             input_ = input_.splitlines(True)
         if isinstance(input_, collections.Iterable):
             stack = EDL(self.fps)
-            for l in input_:
-                l = l.rstrip('\n')  # Remove trailing newlines, usu. from files
-                if l:  # Only spend cycles on lines with data
-                    for m in self._matchers:
-                        if m.apply(stack, l):
-                            break
+            self._start(stack, self._symbol_table())
+            self._apply(stack, input_)
+            stack.resolve_transitions()
         pprint.PrettyPrinter(indent=4)
         return stack
+
+    def _split_chunks(self, lines, count):
+        """Splits the given lines in about ``count`` chunks, each one starting
+        on an event line so the comment, effect and timewarp lines following
+        an event stay in its chunk.
+        """
+        title_regex = TitleMatcher().regex
+        size = max(len(lines) // count, 1)
+        bounds = [0]
+        i = size
+        while i < len(lines):
+            l = lines[i].rstrip('\n')
+            if l and not re.search(title_regex, l) and \
+                    self._event_matcher.split(l) is not None:
+                bounds.append(i)
+                i += size
+            else:
+                i += 1
+        bounds.append(len(lines))
+        return [lines[bounds[j]:bounds[j + 1]]
+                for j in range(len(bounds) - 1)]
+
+    def parse_parallel(self, input_, jobs=None, pool=None,
+                       min_chunk_lines=20000):
+        """Parses a single large EDL on several processes.
+
+        The lines are split in chunks at event lines, the chunks are parsed
+        on a :class:`multiprocessing.Pool` and their events joined back and
+        resolved, giving the same :class:`.EDL` as :meth:`parse`. The
+        workers send back plain values and frame numbers instead of events,
+        the timecodes of the joined events are only built when they are
+        read. Inputs shorter than two chunks are parsed in this process. The
+        :class:`.EventFilter` of the parser, if any, has to be picklable.
+
+        :param input_: The EDL content as a string or an iterable of lines.
+        :param int jobs: The number of processes, defaults to one per core.
+        :param pool: An existing :class:`multiprocessing.Pool` to use instead
+          of starting a new one.
+        :param int min_chunk_lines: The minimum number of lines per chunk.
+        """
+        # imported here so importing the package stays cheap, see cli
+        import multiprocessing
+
+        if isinstance(input_, str):
+            input_ = input_.splitlines(True)
+        lines = list(input_)
+        if jobs is None:
+            jobs = multiprocessing.cpu_count()
+        count = min(jobs * 4, len(lines) // min_chunk_lines)
+        if jobs < 2 or count < 2:
+            return self.parse(lines)
+
+        chunks = self._split_chunks(lines, count)
+        tasks = [(self.fps, self.filter, chunk) for chunk in chunks]
+        if pool is None:
+            own_pool = multiprocessing.Pool(jobs)
+            try:
+                results = own_pool.map(_parse_chunk, tasks, 1)
+            finally:
+                own_pool.close()
+                own_pool.join()
+        else:
+            results = pool.map(_parse_chunk, tasks, 1)
+
+        stack = EDL(self.fps)
+        stack.symbols = self._symbol_table()
+        rec_starts = array.array('l')
+        for title, frames, rows in results:
+            if title:
+                stack.title = title
+            _unpack_chunk(stack, frames, rows)
+            rec_starts.extend(frames[_PACKED_TIMECODES.index('rec_start_tc')::
+                                     len(_PACKED_TIMECODES)])
+        # the record in frames are given so the timecodes of the events are
+        # not built
+        stack.transitions = Transitions(stack.events, rec_starts)
+        return stack
+
+    @classmethod
+    def _seekable(cls, input_):
+        if not hasattr(input_, 'seek') or not hasattr(input_, 'readline'):
+            return False
+        try:
+            input_.tell()
+        except (IOError, OSError):
+            # pipes
+            return False
+        return True
+
+    def parse_lazy(self, input_, cache_size=1024):
+        """Indexes the given input and returns a :class:`.LazyEDL` that
+        parses its events only when they are reached.
+
+        Seekable files are not read in memory, the events are read back from
+        the file when they are reached, so it should stay open.
+
+        :param input_: The EDL content as a string, an iterable of lines or a
+          file.
+        :param int cache_size: The number of parsed events to keep.
+        """
+        if isinstance(input_, str):
+            input_ = input_.splitlines(True)
+        if self._seekable(input_):
+            stack = LazyEDL(self, None, cache_size, file_=input_)
+        else:
+            stack = LazyEDL(self, list(input_), cache_size)
+        self._start(stack, self._symbol_table())
+        stack.index()
+        return stack
@@ -1,3 +1,4 @@
+import re
 import timecode
 
 
@@ -60,3 +61,18 @@ class Timewarp(object):
             'warp_fps': self.warp_fps,
             'timecode': self.timecode
         }
+
+
+def transition_for(tr_code):
+    """Returns a new Effect instance for the given EDL transition code, or
+    None if the code is not known
+    """
+    if tr_code == 'C':
+        return Cut()
+    elif tr_code == 'D':
+        return Dissolve()
+    elif re.match('W\d+', tr_code):
+        return Wipe()
+    elif tr_code == 'K':
+        return Key()
+    return None
@@ -1,4 +1,21 @@
+import re
+
 from .effects import Cut, Timewarp
+from .transitions import transition_duration
+
+
+# a "* KEY: value" comment
+_METADATA_REGEX = re.compile(r'\*\s*([A-Z][A-Z0-9_ ]*?)\s*:\s*(.*)')
+
+
+def comment_metadata(comment):
+    """Returns the ``(key, value)`` pair of a "* KEY: value" comment line, or
+    None for other comments.
+    """
+    mo = _METADATA_REGEX.match(comment)
+    if mo:
+        return mo.group(1), mo.group(2).strip()
+    return None
 
 
 class Event(object):
@@ -9,9 +26,18 @@ class Event(object):
     def __init__(self, options):
         """Initialisation function with options:
         """
-        self.comments = []
+        # a tuple, all the events without comments share the empty one
+        self.comments = ()
+        # the (key, value) pairs of the "* KEY: value" comments, extracted
+        # once by the CommentMatcher
+        self.metadata = ()
         self.timewarp = None
         self.next_event = None
+        self.prev_event = None
+        # set by EDL.resolve_transitions(), the Transitions of the EDL and
+        # the index of this event in it
+        self.transition_table = None
+        self.edl_index = None
         self.track = None
         self.clip_name = None
         self.source_file = None
@@ -31,6 +57,22 @@ class Event(object):
         for o in options:
             self.__dict__[o] = options[o]
 
+    def __getstate__(self):
+        """The links to the other events and the transitions of the EDL are
+        not pickled nor copied, they would pull the whole EDL along. An
+        :class:`.EDL` links its events again when it is unpickled.
+        """
+        state = self.__dict__.copy()
+        state['next_event'] = state['prev_event'] = None
+        state['transition_table'] = state['edl_index'] = None
+        return state
+
+    def _unlink(self):
+        """Forgets the neighbours and the transitions resolved by an EDL.
+        """
+        self.next_event = self.prev_event = None
+        self.transition_table = self.edl_index = None
+
     # def __repr__(self):
     #     v = ["(\n"]
     #     for k in self.__dict__:
@@ -75,13 +117,28 @@ class Event(object):
         return s
 
     def get_comments(self):
-        """Return comments array
+        """Return comments tuple
         """
         return self.comments
 
+    def get_metadata(self):
+        """Return the key/value pairs of the "* KEY: value" comments as a
+        dictionary, with the FROM CLIP NAME and SOURCE FILE values.
+        """
+        metadata = {}
+        if self.clip_name is not None:
+            metadata['FROM CLIP NAME'] = self.clip_name
+        if self.source_file is not None:
+            metadata['SOURCE FILE'] = self.source_file
+        metadata.update(self.metadata)
+        return metadata
+
     def outgoing_transition_duration(self):
-        """TBC
+        """Returns the duration in frames of the transition to the next event
+        on the same track, returns 0 if it is a cut
         """
+        if self.transition_table is not None:
+            return self.transition_table.outgoing[self.edl_index]
         if self.next_event:
             return self.next_event.incoming_transition_duration()
         else:
@@ -108,10 +165,19 @@ class Event(object):
         """Returns incoming transition duration in frames, returns 0 if no
         transition set
         """
-        d = 0
-        if not isinstance(self.transition, Cut):
-            d = int(self.aux)
-        return d
+        if self.transition_table is not None:
+            return self.transition_table.incoming[self.edl_index]
+        return transition_duration(self)
+
+    def transition_overlap(self):
+        """Returns the record start and end frames of the A/B overlap of the
+        incoming transition, both are the record in frame for a cut
+        """
+        if self.transition_table is not None:
+            return (self.transition_table.overlap_start[self.edl_index],
+                    self.transition_table.overlap_end[self.edl_index])
+        start = self.rec_start_tc.frames
+        return start, start + self.incoming_transition_duration()
 
     def ends_with_transition(self):
         """Returns true if the clip ends with a transition (if the next clip
@@ -0,0 +1,94 @@
+import numbers
+
+import timecode
+
+
+class EventFilter(object):
+    """Decides which events a :class:`.Parser` keeps.
+
+    The filter is checked by the :class:`.EventMatcher` right after an event
+    line has been split into its fields and before any :class:`.Event` or
+    :class:`timecode.Timecode` is created for it. Events that are rejected,
+    together with their trailing comment, effect and timewarp lines, are
+    skipped altogether::
+
+      >>> p = Parser('24', filter=EventFilter(tracks=['V']))
+      >>> p = Parser('24', filter=EventFilter(reels=['A001', 'A002'],
+      ...                                     rec_range=('01:00:00:00',
+      ...                                                '01:10:00:00')))
+
+    :param tracks: An iterable of track codes (``'V'``, ``'A'``, ``'AA'``
+      ...) to keep, or None to keep every track.
+    :param reels: An iterable of reel names to keep, or None to keep every
+      reel.
+    :param rec_range: A ``(start, end)`` pair of record timecodes. Each of
+      them can be a timecode string, a :class:`timecode.Timecode` or a frame
+      number. Only events whose record range overlaps ``[start, end)`` are
+      kept. None keeps every event.
+    :param predicate: A callable receiving a dictionary of the raw string
+      fields of the event line (``num``, ``reel``, ``track``, ``tr_code``,
+      ``aux``, ``src_start_tc``, ``src_end_tc``, ``rec_start_tc`` and
+      ``rec_end_tc``) and returning True to keep the event.
+    """
+
+    def __init__(self, tracks=None, reels=None, rec_range=None,
+                 predicate=None):
+        self.tracks = self._to_set(tracks)
+        self.reels = self._to_set(reels)
+        self.rec_range = rec_range
+        self.predicate = predicate
+
+        self._converter = None
+        self._rec_start = None
+        self._rec_end = None
+
+    @classmethod
+    def _to_set(cls, values):
+        if values is None:
+            return None
+        if isinstance(values, basestring):
+            values = [values]
+        return frozenset(values)
+
+    def bind(self, fps):
+        """Prepares the filter for parsing with the given frame rate.
+
+        The record range is converted to frames once here, so every event
+        line only costs two integer conversions.
+        """
+        self._converter = timecode.Timecode(fps)
+        if self.rec_range is not None:
+            start, end = self.rec_range
+            self._rec_start = self._to_frames(start)
+            self._rec_end = self._to_frames(end)
+        return self
+
+    def _to_frames(self, value):
+        if isinstance(value, timecode.Timecode):
+            return value.frames
+        if isinstance(value, numbers.Integral):
+            return value
+        return self._converter.tc_to_frames(value)
+
+    def accepts(self, fields):
+        """Returns True if the event described by the raw ``fields``
+        dictionary should be kept.
+        """
+        if self.tracks is not None and fields['track'] not in self.tracks:
+            return False
+        if self.reels is not None and fields['reel'] not in self.reels:
+            return False
+        if self.rec_range is not None:
+            if self._converter is None:
+                raise RuntimeError('EventFilter.bind() should be called '
+                                   'before filtering on rec_range')
+            rec_in = self._converter.tc_to_frames(fields['rec_start_tc'])
+            if rec_in >= self._rec_end:
+                return False
+            rec_out = self._converter.tc_to_frames(fields['rec_end_tc'])
+            # zero length events still occupy their record frame
+            if max(rec_out, rec_in + 1) <= self._rec_start:
+                return False
+        if self.predicate is not None and not self.predicate(fields):
+            return False
+        return True
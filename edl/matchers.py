@@ -1,8 +1,8 @@
 import re
 import sys
 import timecode
-from .effects import Timewarp, Cut, Dissolve, Wipe, Key
-from .event import Event
+from .effects import Timewarp, transition_for
+from .event import Event, comment_metadata
 
 
 class Matcher(object):
@@ -11,6 +11,16 @@ class Matcher(object):
 
     def __init__(self, with_regex):
         self.regex = with_regex
+        # the SymbolTable of the current parse, set by the Parser
+        self.symbols = None
+
+    def intern(self, value):
+        """Returns the shared copy of the given string from the current
+        :class:`.SymbolTable`, or the string itself if there is none.
+        """
+        if self.symbols is None:
+            return value
+        return self.symbols.intern(value)
 
     def matches(self, line):
         return re.match(self.regex, line)
@@ -48,10 +58,16 @@ class CommentMatcher(Matcher):
         if m:
             # TODO: Handle comments that are not tied to an event
             if len(stack) > 0:
-                stack[-1].comments.append("* " + m.group(1))
+                evt = stack[-1]
+                comment = self.intern("* " + m.group(1))
+                evt.comments += (comment,)
+                pair = comment_metadata(comment)
+                if pair is not None:
+                    evt.metadata += ((self.intern(pair[0]),
+                                      self.intern(pair[1])),)
                 mo = re.search('\*\s+FROM\s+CLIP\s+NAME:\s+(.+)', line)
                 if mo:
-                    stack[-1].clip_name = mo.group(1).strip()
+                    evt.clip_name = self.intern(mo.group(1).strip())
                 return True
         else:
             return False
@@ -80,7 +96,7 @@ class NameMatcher(Matcher):
     def apply(self, stack, line):
         m = re.search(self.regex, line)
         if m and len(stack) > 0:
-            stack[-1].clip_name = m.group(2).strip()
+            stack[-1].clip_name = self.intern(m.group(2).strip())
             return True
         else:
             return False
@@ -97,7 +113,7 @@ class SourceMatcher(Matcher):
         m = re.search(self.regex, line)
 
         if m and len(stack) > 0:
-            stack[-1].source_file = m.group(2).strip()
+            stack[-1].source_file = self.intern(m.group(2).strip())
             return True
         else:
             return False
@@ -113,7 +129,7 @@ class EffectMatcher(Matcher):
     def apply(self, stack, line):
         m = re.search(self.regex, line)
         if m:
-            stack[-1].transition.effect = m.group(2).strip()
+            stack[-1].transition.effect = self.intern(m.group(2).strip())
             return True
         else:
             return False
@@ -133,7 +149,8 @@ class TimewarpMatcher(Matcher):
         m = re.search(self.regexp, line)
         if m:
             stack[-1].timewarp = \
-                Timewarp(m.group(1), m.group(2), m.group(3), self.fps)
+                Timewarp(self.intern(m.group(1)), m.group(2), m.group(3),
+                         self.fps)
             if float(m.group(2)) < 0:
                 stack[-1].timewarp.reverse = True
             return True
@@ -145,7 +162,7 @@ class EventMatcher(Matcher):
     """No documentation for this class yet.
     """
 
-    def __init__(self, fps):
+    def __init__(self, fps, event_filter=None):
         regexp = re.compile(
             r"(?P<num>\d+)\s+"
             r"(?P<reel>\S+)\s+"
@@ -158,6 +175,10 @@ class EventMatcher(Matcher):
             r"(?P<rec_out>\d{1,2}:\d{1,2}:\d{1,2}[:;]\d{1,3})")
         Matcher.__init__(self, regexp)
         self.fps = fps
+        self.event_filter = event_filter
+        # True while the last event line was rejected by the event_filter,
+        # the Parser then drops the lines that belong to that event
+        self.skipping = False
         self._keys = ['num', 'reel', 'track', 'tr_code', 'aux', 'src_start_tc',
                       'src_end_tc', 'rec_start_tc', 'rec_end_tc']
 
@@ -165,25 +186,34 @@ class EventMatcher(Matcher):
     def stripper(cls, in_string):
         return in_string.strip()
 
-    def apply(self, stack, line):
+    # the fields that are shared through the SymbolTable, event numbers are
+    # nearly unique and only grow the table
+    _interned_keys = ('reel', 'track', 'tr_code', 'aux')
+
+    def split(self, line):
+        """Returns the raw string fields of the given event line as a
+        dictionary, or None if the line is not an event line.
+        """
         m = re.search(self.regex, line.strip())
         if m:
             matches = m.groups()
             values = map(self.stripper, matches)
-            evt = Event(dict(zip(self._keys, values)))
-            t = evt.tr_code
-            if t == 'C':
-                if len(stack) > 0:
-                    stack[-1].next_event = evt
-                evt.transition = Cut()
-            elif t == 'D':
-                evt.transition = Dissolve()
-            elif re.match('W\d+', t):
-                evt.transition = Wipe()
-            elif t == 'K':
-                evt.transition = Key()
-            else:
-                evt.transition = None
+            return dict(zip(self._keys, values))
+        return None
+
+    def apply(self, stack, line):
+        fields = self.split(line)
+        if fields is not None:
+            if self.event_filter is not None and \
+                    not self.event_filter.accepts(fields):
+                self.skipping = True
+                return True
+            if self.symbols is not None:
+                for key in self._interned_keys:
+                    fields[key] = self.symbols.intern(fields[key])
+            self.skipping = False
+            evt = Event(fields)
+            evt.transition = transition_for(evt.tr_code)
             evt.src_start_tc = timecode.Timecode(self.fps, evt.src_start_tc)
             evt.src_end_tc = timecode.Timecode(self.fps, evt.src_end_tc)
             evt.rec_start_tc = timecode.Timecode(self.fps, evt.rec_start_tc)
@@ -0,0 +1,327 @@
+"""Shared memory export of parsed EDLs.
+
+:func:`export_shared` writes an :class:`.EDL` into a single shared memory
+block laid out in columns: the frame numbers of the events as 64 bit integer
+arrays, every string of the EDL once in a string table, and the reel, clip
+name, comment ... columns as 32 bit indices into that table. Other processes
+attach to the block by its name with :func:`attach_shared` and get a
+read-only :class:`SharedEDL` view, reading the columns in place::
+
+  >>> shared = export_shared(edl)
+  >>> pool.map(render_shot, [(shared, i) for i in range(len(shared))])
+  >>> shared.close()
+  >>> shared.unlink()
+
+A :class:`SharedEDL` is pickled as the name of its block only, so sending it
+to any number of worker processes costs the same whatever the size of the
+EDL.
+
+The block is a memory mapped file in ``/dev/shm``, or in the temporary
+directory when there is no ``/dev/shm``.
+"""
+import mmap
+import os
+import struct
+import tempfile
+import uuid
+
+import timecode
+
+from .edl import ReadOnlyEDL
+from .effects import Timewarp, transition_for
+from .event import Event, comment_metadata
+
+
+MAGIC = b'EDL2'
+
+_HEADER = struct.Struct('<4sIIIii')
+_HEADER_SIZE = 64
+
+# the 64 bit integer columns of the frame numbers
+_FRAME_COLUMNS = ['src_start', 'src_end', 'rec_start', 'rec_end', 'warp_tc']
+# the 32 bit integer columns, string ids are -1 for None
+_INDEX_COLUMNS = ['num', 'reel', 'track', 'tr_code', 'aux', 'clip_name',
+                  'source_file', 'effect', 'warp_reel', 'comment_start',
+                  'comment_count', 'flags']
+
+_HAS_TIMEWARP = 1
+_REVERSE = 2
+
+_Q = struct.Struct('<q')
+_D = struct.Struct('<d')
+_I = struct.Struct('<i')
+
+
+def _layout(n_events, n_strings, n_comments):
+    """Returns the offsets of each section of a block, the string data goes
+    at the ``strings`` offset up to the end of the block.
+    """
+    offsets = {}
+    offset = _HEADER_SIZE
+    for name in _FRAME_COLUMNS + ['warp_fps']:
+        offsets[name] = offset
+        offset += 8 * n_events
+    offsets['string_offsets'] = offset
+    offset += 8 * (n_strings + 1)
+    for name in _INDEX_COLUMNS:
+        offsets[name] = offset
+        offset += 4 * n_events
+    offsets['comments'] = offset
+    offset += 4 * n_comments
+    offsets['strings'] = offset
+    return offsets
+
+
+def _to_bytes(value):
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    return value
+
+
+class _Block(object):
+    """A named block of memory shared between processes.
+    """
+
+    def __init__(self, name=None, size=0):
+        if name is None:
+            name = 'edl_%s' % uuid.uuid4().hex
+            with open(self._path(name), 'w+b') as f:
+                f.truncate(size)
+                self._mmap = mmap.mmap(f.fileno(), size)
+        else:
+            with open(self._path(name), 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.name = name
+        self.buf = self._mmap
+
+    @classmethod
+    def _path(cls, name):
+        if os.path.isdir('/dev/shm'):
+            return os.path.join('/dev/shm', name)
+        return os.path.join(tempfile.gettempdir(), name)
+
+    def close(self):
+        self._mmap.close()
+        self.buf = None
+
+    def unlink(self):
+        os.remove(self._path(self.name))
+
+
+def export_shared(edl):
+    """Writes the given :class:`.EDL` to a new shared memory block and
+    returns a :class:`SharedEDL` view of it.
+
+    The process exporting the EDL owns the block, it should call
+    :meth:`SharedEDL.unlink` once the workers are done with it.
+    """
+    string_ids = {}
+    strings = []
+
+    def sym(value):
+        if value is None:
+            return -1
+        try:
+            return string_ids[value]
+        except KeyError:
+            string_ids[value] = len(strings)
+            strings.append(_to_bytes(value))
+            return string_ids[value]
+
+    n = len(edl)
+    frames = dict((name, []) for name in _FRAME_COLUMNS)
+    indices = dict((name, []) for name in _INDEX_COLUMNS)
+    warp_fps = []
+    comments = []
+    for e in edl.events:
+        frames['src_start'].append(e.src_start_tc.frames)
+        frames['src_end'].append(e.src_end_tc.frames)
+        frames['rec_start'].append(e.rec_start_tc.frames)
+        frames['rec_end'].append(e.rec_end_tc.frames)
+        flags = 0
+        if e.has_timewarp():
+            flags |= _HAS_TIMEWARP
+            if e.timewarp.reverse:
+                flags |= _REVERSE
+            frames['warp_tc'].append(e.timewarp.timecode.frames)
+            warp_fps.append(e.timewarp.warp_fps)
+            indices['warp_reel'].append(sym(e.timewarp.reel))
+        else:
+            frames['warp_tc'].append(0)
+            warp_fps.append(0.0)
+            indices['warp_reel'].append(-1)
+        indices['flags'].append(flags)
+        for key in ('num', 'reel', 'track', 'tr_code', 'aux', 'clip_name',
+                    'source_file'):
+            indices[key].append(sym(getattr(e, key)))
+        indices['effect'].append(
+            sym(getattr(e.transition, 'effect', None)))
+        indices['comment_start'].append(len(comments))
+        indices['comment_count'].append(len(e.comments))
+        comments.extend(sym(c) for c in e.comments)
+    fps_id = sym(str(edl.fps))
+    title_id = sym(edl.title)
+
+    offsets = _layout(n, len(strings), len(comments))
+    string_offsets = [0]
+    for s in strings:
+        string_offsets.append(string_offsets[-1] + len(s))
+    size = offsets['strings'] + string_offsets[-1]
+
+    block = _Block(size=max(size, _HEADER_SIZE))
+    buf = block.buf
+
+    def write(offset, fmt, values):
+        data = struct.pack('<%d%s' % (len(values), fmt), *values)
+        buf[offset:offset + len(data)] = data
+
+    for name in _FRAME_COLUMNS:
+        write(offsets[name], 'q', frames[name])
+    write(offsets['warp_fps'], 'd', warp_fps)
+    write(offsets['string_offsets'], 'q', string_offsets)
+    for name in _INDEX_COLUMNS:
+        write(offsets[name], 'i', indices[name])
+    write(offsets['comments'], 'i', comments)
+    data = b''.join(strings)
+    buf[offsets['strings']:offsets['strings'] + len(data)] = data
+    # the header goes last, so a block is never seen half written
+    buf[0:_HEADER.size] = _HEADER.pack(MAGIC, n, len(strings), len(comments),
+                                       fps_id, title_id)
+    return SharedEDL(block, owner=True)
+
+
+def attach_shared(name):
+    """Returns a read-only :class:`SharedEDL` view of the shared EDL block
+    with the given name.
+    """
+    return SharedEDL(_Block(name))
+
+
+class SharedEDL(ReadOnlyEDL):
+    """A read-only :class:`.EDL` view of a block written by
+    :func:`export_shared`.
+
+    :class:`.Event` instances are built on demand from the columns when the
+    view is indexed or iterated, the plain values can also be read without
+    building any object through :meth:`rec_range`, :meth:`src_range` and
+    :meth:`reel`.
+    """
+
+    def __init__(self, block, owner=False):
+        self._block = block
+        self._owner = owner
+        self._strings = {}
+        magic, n, n_strings, n_comments, fps_id, title_id = \
+            _HEADER.unpack_from(block.buf, 0)
+        if magic != MAGIC:
+            raise ValueError('%s is not a shared EDL block' % block.name)
+        self._len = n
+        self._offsets = _layout(n, n_strings, n_comments)
+        ReadOnlyEDL.__init__(self, self._string(fps_id),
+                             self._string(title_id))
+
+    @property
+    def name(self):
+        """The name of the shared memory block, to attach to it with
+        :func:`attach_shared`.
+        """
+        return self._block.name
+
+    def __reduce__(self):
+        return attach_shared, (self.name,)
+
+    def close(self):
+        """Closes this view of the block, the block itself stays available to
+        the other processes until :meth:`unlink` is called.
+        """
+        self._block.close()
+
+    def unlink(self):
+        """Removes the block. Only the process that exported the EDL should
+        call it.
+        """
+        if not self._owner:
+            raise ValueError('only the owner of a shared EDL can unlink it')
+        self._block.unlink()
+
+    def _string(self, i):
+        if i < 0:
+            return None
+        try:
+            return self._strings[i]
+        except KeyError:
+            offset = self._offsets['string_offsets'] + 8 * i
+            start, end = struct.unpack_from('<qq', self._block.buf, offset)
+            start += self._offsets['strings']
+            end += self._offsets['strings']
+            value = self._block.buf[start:end]
+            self._strings[i] = value
+            return value
+
+    def _frames(self, column, i):
+        return _Q.unpack_from(self._block.buf,
+                              self._offsets[column] + 8 * i)[0]
+
+    def _index(self, column, i):
+        return _I.unpack_from(self._block.buf,
+                              self._offsets[column] + 4 * i)[0]
+
+    def rec_range(self, i):
+        """Returns the record in and out frames of the event at the given
+        index.
+        """
+        i = self._check(i)
+        return self._frames('rec_start', i), self._frames('rec_end', i)
+
+    def src_range(self, i):
+        """Returns the source in and out frames of the event at the given
+        index.
+        """
+        i = self._check(i)
+        return self._frames('src_start', i), self._frames('src_end', i)
+
+    def reel(self, i):
+        """Returns the reel of the event at the given index.
+        """
+        return self._string(self._index('reel', self._check(i)))
+
+    def __len__(self):
+        return self._len
+
+    def _event(self, i):
+        s = self._string
+        fields = {}
+        for key in ('num', 'reel', 'track', 'tr_code', 'aux', 'clip_name',
+                    'source_file'):
+            fields[key] = s(self._index(key, i))
+        for key, column in (('src_start_tc', 'src_start'),
+                            ('src_end_tc', 'src_end'),
+                            ('rec_start_tc', 'rec_start'),
+                            ('rec_end_tc', 'rec_end')):
+            fields[key] = timecode.Timecode(self.fps,
+                                            frames=self._frames(column, i))
+        evt = Event(fields)
+        evt.transition = transition_for(evt.tr_code)
+        effect = s(self._index('effect', i))
+        if effect is not None and evt.transition is not None:
+            evt.transition.effect = effect
+
+        start = self._index('comment_start', i)
+        evt.comments = tuple(
+            s(self._index('comments', j))
+            for j in range(start, start + self._index('comment_count', i)))
+        evt.metadata = tuple(pair for pair in map(comment_metadata,
+                                                  evt.comments)
+                             if pair is not None)
+
+        flags = self._index('flags', i)
+        if flags & _HAS_TIMEWARP:
+            evt.timewarp = Timewarp(s(self._index('warp_reel', i)),
+                                    _D.unpack_from(self._block.buf,
+                                                   self._offsets['warp_fps'] +
+                                                   8 * i)[0],
+                                    None, self.fps)
+            evt.timewarp.timecode = timecode.Timecode(
+                self.fps, frames=self._frames('warp_tc', i))
+            evt.timewarp.reverse = bool(flags & _REVERSE)
+        return evt
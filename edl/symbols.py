@@ -0,0 +1,55 @@
+class SymbolTable(object):
+    """Interns the strings that repeat throughout EDLs.
+
+    Reel names, track and transition codes, clip names, source files and
+    comment lines are repeated many times in an EDL and across the EDLs of
+    a show. The :class:`.Parser` passes them through a SymbolTable so that
+    every :class:`.Event` holding the same value shares a single string
+    object. By default each call to :meth:`.Parser.parse` uses its own
+    table, pass the same table to several parsers to share the strings
+    between all the EDLs they read::
+
+      >>> symbols = SymbolTable()
+      >>> a = Parser('24', symbols=symbols).parse(f1)
+      >>> b = Parser('24', symbols=symbols).parse(f2)
+      >>> a[0].reel is b[0].reel
+      True
+    """
+
+    def __init__(self):
+        self._symbols = {}
+
+    def __len__(self):
+        return len(self._symbols)
+
+    def __contains__(self, value):
+        return value in self._symbols
+
+    def __iter__(self):
+        return iter(self._symbols)
+
+    def intern(self, value):
+        """Returns the shared copy of the given value, registering it first if
+        it is not known yet. None is returned as is.
+        """
+        if value is None:
+            return None
+        return self._symbols.setdefault(value, value)
+
+    def intern_event(self, event):
+        """Replaces the strings of the given :class:`.Event` by their shared
+        copies, for events that were not parsed with this table.
+        """
+        intern = self.intern
+        for key in ('reel', 'track', 'tr_code', 'aux', 'clip_name',
+                    'source_file'):
+            setattr(event, key, intern(getattr(event, key)))
+        event.comments = tuple(intern(c) for c in event.comments)
+        event.metadata = tuple((intern(k), intern(v))
+                               for k, v in event.metadata)
+        effect = getattr(event.transition, 'effect', None)
+        if effect is not None:
+            event.transition.effect = intern(effect)
+        if event.timewarp is not None:
+            event.timewarp.reel = intern(event.timewarp.reel)
+        return event
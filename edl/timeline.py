@@ -0,0 +1,403 @@
+import copy
+import random
+
+import timecode
+
+from .edl import EDL
+
+
+class _Node(object):
+    """A clip of a :class:`Track`, node of its implicit treap.
+
+    ``gap`` is the number of record frames between the end of the previous
+    clip and the start of this one, it can be negative for overlapping
+    clips. ``total`` is the record duration of the whole subtree, gaps
+    included.
+    """
+
+    __slots__ = ('event', 'gap', 'length', 'priority', 'left', 'right',
+                 'size', 'total')
+
+    def __init__(self, event, length, gap=0, priority=None):
+        self.event = event
+        self.gap = gap
+        self.length = length
+        self.priority = random.random() if priority is None else priority
+        self.left = None
+        self.right = None
+        self.size = 1
+        self.total = gap + length
+
+
+def _size(node):
+    return node.size if node is not None else 0
+
+
+def _total(node):
+    return node.total if node is not None else 0
+
+
+def _update(node):
+    node.size = 1 + _size(node.left) + _size(node.right)
+    node.total = node.gap + node.length + _total(node.left) + \
+        _total(node.right)
+
+
+def _split(node, k):
+    """Splits the given tree in a tree of its first k nodes and a tree of the
+    others.
+    """
+    if node is None:
+        return None, None
+    if _size(node.left) >= k:
+        left, node.left = _split(node.left, k)
+        _update(node)
+        return left, node
+    node.right, right = _split(node.right, k - _size(node.left) - 1)
+    _update(node)
+    return node, right
+
+
+def _merge(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+
+def _build(nodes):
+    """Builds a balanced tree of the given nodes in O(n log n), the
+    priorities are dealt by level so the heap order holds.
+    """
+    if not nodes:
+        return None
+    priorities = sorted((random.random() for _ in nodes), reverse=True)
+    levels = []
+
+    def place(lo, hi, depth):
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        while len(levels) <= depth:
+            levels.append([])
+        levels[depth].append(nodes[mid])
+        nodes[mid].left = place(lo, mid, depth + 1)
+        nodes[mid].right = place(mid + 1, hi, depth + 1)
+        return nodes[mid]
+
+    root = place(0, len(nodes), 0)
+    i = 0
+    for level in levels:
+        for node in level:
+            node.priority = priorities[i]
+            i += 1
+    for level in reversed(levels):
+        for node in level:
+            _update(node)
+    return root
+
+
+def _in_order(node):
+    stack = []
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        yield node
+        node = node.right
+
+
+class Track(object):
+    """The clips of one track of a :class:`Timeline`.
+
+    The clips are kept in an implicit treap where each node knows the record
+    duration of its subtree, so the record position of a clip is never
+    stored but summed from the root. Ripple edits only touch O(log n) nodes
+    and shift every later clip at once.
+
+    Clip indices are the positions of the clips in the track, in record
+    order.
+    """
+
+    def __init__(self, name, fps, start=1):
+        self.name = name
+        self.fps = fps
+        #: record frame of the start of the track
+        self.start = start
+        self._root = None
+
+    def __len__(self):
+        return _size(self._root)
+
+    @property
+    def duration(self):
+        """The record duration of the track in frames.
+        """
+        return _total(self._root)
+
+    def _check(self, i, size=None):
+        size = len(self) if size is None else size
+        if i < 0:
+            i += size
+        if not 0 <= i < size:
+            raise IndexError('clip index out of range')
+        return i
+
+    def _take(self, i):
+        """Splits the tree around the clip at the given index, returns the
+        trees before and after it and its node.
+        """
+        left, right = _split(self._root, i)
+        node, right = _split(right, 1)
+        return left, node, right
+
+    def event(self, i):
+        """Returns the :class:`.Event` of the clip at the given index, its
+        record timecodes are only updated by :meth:`Timeline.to_edl`.
+        """
+        i = self._check(i)
+        node = self._root
+        while True:
+            k = _size(node.left)
+            if i < k:
+                node = node.left
+            elif i == k:
+                return node.event
+            else:
+                i -= k + 1
+                node = node.right
+
+    def rec_range(self, i):
+        """Returns the current record in and out frames of the clip at the
+        given index.
+        """
+        i = self._check(i)
+        position = self.start
+        node = self._root
+        while True:
+            k = _size(node.left)
+            if i < k:
+                node = node.left
+            elif i == k:
+                position += _total(node.left) + node.gap
+                return position, position + node.length
+            else:
+                position += _total(node.left) + node.gap + node.length
+                i -= k + 1
+                node = node.right
+
+    def index_at(self, frame):
+        """Returns the index of the clip at the given record frame, or None
+        if the frame is in a gap or outside of the track.
+        """
+        offset = frame - self.start
+        node = self._root
+        i = 0
+        while node is not None:
+            left = _total(node.left)
+            if offset < left:
+                node = node.left
+                continue
+            offset -= left
+            i += _size(node.left)
+            if offset < node.gap:
+                return None
+            offset -= node.gap
+            if offset < node.length:
+                return i
+            offset -= node.length
+            i += 1
+            node = node.right
+        return None
+
+    def append(self, event, length=None, gap=0):
+        """Adds a clip at the end of the track.
+        """
+        self._root = _merge(self._root,
+                            _Node(event, self._length(event, length), gap))
+
+    @classmethod
+    def _length(cls, event, length):
+        if length is not None:
+            return length
+        if event.rec_start_tc is not None and event.rec_end_tc is not None:
+            return event.rec_length()
+        return event.src_length()
+
+    def insert(self, i, event, length=None):
+        """Ripple inserts the given event before the clip at the given index,
+        or at the end of the track if the index is the track length.
+
+        The clip takes ``length`` record frames, defaulting to the record
+        length of the event or to its source length when it has no record
+        timecodes yet. The clips after it are pushed later.
+        """
+        i = self._check(i, len(self) + 1)
+        node = _Node(event, self._length(event, length))
+        left, right = _split(self._root, i)
+        if right is not None:
+            # the new clip starts where the pushed clip started
+            first, right = _split(right, 1)
+            node.gap, first.gap = first.gap, 0
+            _update(node)
+            _update(first)
+            right = _merge(first, right)
+        self._root = _merge(_merge(left, node), right)
+
+    def delete(self, i):
+        """Ripple deletes the clip at the given index and returns its event.
+
+        The gap before the clip is kept, the clips after it are pulled
+        earlier by its length.
+        """
+        i = self._check(i)
+        left, node, right = self._take(i)
+        if right is not None:
+            first, right = _split(right, 1)
+            first.gap += node.gap
+            _update(first)
+            right = _merge(first, right)
+        self._root = _merge(left, right)
+        return node.event
+
+    def trim(self, i, head=0, tail=0):
+        """Ripple trims the clip at the given index.
+
+        ``head`` frames are removed from the start of the clip and ``tail``
+        frames from its end, negative values extend the clip. The source
+        timecodes of the event are moved accordingly and the clips after it
+        are shifted by the change of length.
+        """
+        i = self._check(i)
+        left, node, right = self._take(i)
+        length = node.length - head - tail
+        if length < 0:
+            self._root = _merge(_merge(left, node), right)
+            raise ValueError('can not trim %d frames from a %d frames clip'
+                             % (head + tail, node.length))
+        event = copy.copy(node.event)
+        event.src_start_tc = timecode.Timecode(
+            self.fps, frames=event.src_start_tc.frames + head)
+        event.src_end_tc = timecode.Timecode(
+            self.fps, frames=event.src_end_tc.frames - tail)
+        # its transitions are resolved again by Timeline.to_edl()
+        event.transition_table = None
+        node.event = event
+        node.length = length
+        _update(node)
+        self._root = _merge(_merge(left, node), right)
+        return event
+
+    def move(self, i, j):
+        """Ripple moves the clip at index ``i`` so it ends up at index ``j``.
+        """
+        i = self._check(i)
+        j = self._check(j)
+        left, node, right = self._take(i)
+        length = node.length
+        if right is not None:
+            first, right = _split(right, 1)
+            first.gap += node.gap
+            _update(first)
+            right = _merge(first, right)
+        self._root = _merge(left, right)
+        self.insert(j, node.event, length)
+
+    def clips(self):
+        """Yields the ``(event, rec_start, rec_end)`` of the clips in record
+        order, in O(n).
+        """
+        position = self.start
+        for node in _in_order(self._root):
+            position += node.gap
+            yield node.event, position, position + node.length
+            position += node.length
+
+
+class Timeline(object):
+    """An editable timeline over the events of an :class:`.EDL`.
+
+    The events are split by track, each :class:`Track` supporting ripple
+    insert, delete, trim and move in O(log n). :meth:`to_edl` writes the
+    result back as a normal EDL::
+
+      >>> t = Timeline(Parser('24').parse(f))
+      >>> v = t.track('V')
+      >>> v.insert(0, slate, length=48)
+      >>> v.delete(v.index_at(86400 + 1000))
+      >>> v.trim(10, head=12, tail=12)
+      >>> edl = t.to_edl()
+
+    Gaps between the clips of a track are kept, and stay in front of the
+    clip following them through the edits.
+    """
+
+    def __init__(self, edl):
+        self.fps = edl.fps
+        self.title = edl.title
+        self._tracks = {}
+        self._order = []
+
+        by_track = {}
+        for e in edl:
+            if e.track not in by_track:
+                by_track[e.track] = []
+                self._order.append(e.track)
+            by_track[e.track].append(e)
+        starts = [e.rec_start_tc.frames for e in edl]
+        self.start = min(starts) if starts else 1
+
+        for name in self._order:
+            events = sorted(by_track[name], key=lambda e: e.rec_start_tc.frames)
+            track = Track(name, self.fps, events[0].rec_start_tc.frames)
+            nodes = []
+            end = track.start
+            for e in events:
+                nodes.append(_Node(e, e.rec_length(),
+                                   e.rec_start_tc.frames - end))
+                end = e.rec_end_tc.frames
+            track._root = _build(nodes)
+            self._tracks[name] = track
+
+    def tracks(self):
+        """Returns the names of the tracks in the order they appear.
+        """
+        return list(self._order)
+
+    def track(self, name):
+        """Returns the :class:`Track` with the given name, creating an empty
+        one starting at the start of the timeline if there is none.
+        """
+        if name not in self._tracks:
+            self._tracks[name] = Track(name, self.fps, self.start)
+            self._order.append(name)
+        return self._tracks[name]
+
+    def to_edl(self):
+        """Returns a new :class:`.EDL` holding copies of the events with
+        their record timecodes set from the timeline. The events are sorted
+        by record in and their transitions resolved.
+        """
+        clips = []
+        for order, name in enumerate(self._order):
+            for i, (e, start, end) in enumerate(self._tracks[name].clips()):
+                clips.append((start, order, i, end, e))
+        clips.sort(key=lambda c: c[:3])
+
+        edl = EDL(self.fps)
+        edl.title = self.title
+        for start, order, i, end, e in clips:
+            e = copy.copy(e)
+            e.rec_start_tc = timecode.Timecode(self.fps, frames=start)
+            e.rec_end_tc = timecode.Timecode(self.fps, frames=end)
+            edl.append(e)
+        edl.resolve_transitions()
+        return edl
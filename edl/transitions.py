@@ -0,0 +1,87 @@
+import array
+
+from .effects import Cut
+
+
+def transition_duration(event):
+    """Returns the duration in frames of the transition an event starts with,
+    0 for cuts and for transitions without a numeric duration.
+    """
+    if event.transition is None or isinstance(event.transition, Cut):
+        return 0
+    aux = event.aux or ''
+    if not aux.isdigit():
+        return 0
+    return int(aux)
+
+
+class Transitions(object):
+    """The transitions between the events of an EDL, resolved in a single
+    pass over the events.
+
+    Each event is linked to the previous and next events on the same track,
+    the transitions are stored in arrays indexed like the events:
+
+    * ``previous`` and ``next``: the index of the neighbour event on the same
+      track, -1 if there is none,
+    * ``incoming`` and ``outgoing``: the duration in frames of the transition
+      the event starts and ends with,
+    * ``overlap_start`` and ``overlap_end``: the record frames where the
+      outgoing and the incoming events of a transition overlap (the A/B
+      overlap), both equal to the record in of the event when it starts with
+      a cut.
+
+    Created by :meth:`.EDL.resolve_transitions`, which the :class:`.Parser`
+    calls at the end of each parse.
+
+    :param events: The events of the EDL.
+    :param rec_starts: The record in frames of the events, read from their
+      ``rec_start_tc`` when skipped.
+    """
+
+    def __init__(self, events, rec_starts=None):
+        n = len(events)
+        self.previous = array.array('l', [-1]) * n
+        self.next = array.array('l', [-1]) * n
+        self.incoming = array.array('l', [0]) * n
+        self.outgoing = array.array('l', [0]) * n
+        self.overlap_start = array.array('l', [0]) * n
+        self.overlap_end = array.array('l', [0]) * n
+
+        last = {}
+        for i, e in enumerate(events):
+            p = last.get(e.track, -1)
+            last[e.track] = i
+            d = transition_duration(e)
+            if rec_starts is None:
+                start = e.rec_start_tc.frames
+            else:
+                start = rec_starts[i]
+            self.previous[i] = p
+            self.incoming[i] = d
+            self.overlap_start[i] = start
+            self.overlap_end[i] = start + d
+            if p >= 0:
+                self.next[p] = i
+                self.outgoing[p] = d
+
+        for i, e in enumerate(events):
+            e.transition_table = self
+            e.edl_index = i
+            p = self.previous[i]
+            e.prev_event = events[p] if p >= 0 else None
+            n = self.next[i]
+            e.next_event = events[n] if n >= 0 else None
+
+    def __len__(self):
+        return len(self.incoming)
+
+    def with_transition(self):
+        """Returns the indices of the events starting with a transition.
+        """
+        return [i for i, d in enumerate(self.incoming) if d]
+
+    def total_overlap(self):
+        """Returns the number of record frames covered by transitions.
+        """
+        return sum(self.incoming)
@@ -0,0 +1,171 @@
+import bisect
+import collections
+import json
+
+
+class SourceUsage(collections.namedtuple('SourceUsage',
+                                         ['start', 'end', 'edl', 'num'])):
+    """The ``[start, end)`` source frames of a source used by the event number
+    ``num`` of the EDL named ``edl``.
+    """
+    __slots__ = ()
+
+
+class SourceUsageIndex(object):
+    """Indexes which source frames are used by the EDLs of a show.
+
+    Each event is indexed under its reel and, when it has one, its source
+    file, so both can be queried. For each of them the index keeps the
+    merged set of used source frame ranges, every range being tagged with
+    the EDLs and event numbers that use it::
+
+      >>> index = SourceUsageIndex()
+      >>> index.add('reel1_v12.edl', Parser('24').parse(f))
+      >>> index.contains('A001C003', 86400, 86424)
+      True
+      >>> [(u.edl, u.num) for u in index.overlaps('A001C003', 86400, 86424)]
+      [('reel1_v12.edl', '012')]
+      >>> index.remove('reel1_v12.edl')
+      >>> index.save('show.json')
+
+    Frames are the ``frames`` of the source timecodes of the events, so
+    every EDL of an index should share the same frame rate. Black slugs and
+    zero length events are not indexed.
+    """
+
+    def __init__(self):
+        self._edls = {}
+        self._usages = {}
+        self._segments = {}
+
+    def __contains__(self, name):
+        return name in self._edls
+
+    def __len__(self):
+        return len(self._edls)
+
+    def edls(self):
+        """Returns the names of the indexed EDLs.
+        """
+        return sorted(self._edls)
+
+    def sources(self):
+        """Returns the indexed reels and source files.
+        """
+        return sorted(s for s in self._usages if self._usages[s])
+
+    def add(self, name, edl):
+        """Indexes the events of the given :class:`.EDL` under the given name,
+        replacing the EDL previously indexed with that name.
+        """
+        records = []
+        for e in edl:
+            if e.black() or e.src_length() <= 0:
+                continue
+            start = e.src_start_tc.frames
+            end = e.src_end_tc.frames
+            for source in (e.reel, e.source_file):
+                if source is not None:
+                    records.append((source, start, end, e.num))
+        self._add_records(name, records)
+
+    def _add_records(self, name, records):
+        if name in self._edls:
+            self.remove(name)
+        self._edls[name] = records
+        for source, start, end, num in records:
+            self._usages.setdefault(source, []).append(
+                SourceUsage(start, end, name, num))
+            self._segments.pop(source, None)
+
+    def remove(self, name):
+        """Removes the EDL indexed with the given name.
+        """
+        records = self._edls.pop(name)
+        for source in set(r[0] for r in records):
+            self._usages[source] = [u for u in self._usages[source]
+                                    if u.edl != name]
+            if not self._usages[source]:
+                del self._usages[source]
+            self._segments.pop(source, None)
+
+    def _get_segments(self, source):
+        """Returns the merged ranges of the given source as a list of their
+        start frames and a list of ``(start, end, usages)`` tuples, built
+        again only after the source has changed.
+        """
+        try:
+            return self._segments[source]
+        except KeyError:
+            pass
+        if source not in self._usages:
+            # not cached, unknown sources would grow the cache forever
+            return [], []
+        starts = []
+        segments = []
+        for u in sorted(self._usages[source]):
+            if segments and u.start <= segments[-1][1]:
+                start, end, usages = segments[-1]
+                usages.append(u)
+                segments[-1] = (start, max(end, u.end), usages)
+            else:
+                starts.append(u.start)
+                segments.append((u.start, u.end, [u]))
+        self._segments[source] = starts, segments
+        return starts, segments
+
+    def used_ranges(self, source):
+        """Returns the merged used frame ranges of the given reel or source
+        file as a list of ``(start, end, usages)`` tuples, where ``usages``
+        is the list of the :class:`SourceUsage` making the range.
+        """
+        return list(self._get_segments(source)[1])
+
+    @classmethod
+    def _frames(cls, value):
+        return getattr(value, 'frames', value)
+
+    def contains(self, source, start, end):
+        """Returns True if the ``[start, end)`` frames of the given reel or
+        source file are all used by the indexed EDLs.
+
+        ``start`` and ``end`` can be frame numbers or
+        :class:`timecode.Timecode` instances.
+        """
+        start, end = self._frames(start), self._frames(end)
+        starts, segments = self._get_segments(source)
+        i = bisect.bisect_right(starts, start) - 1
+        return i >= 0 and segments[i][1] >= end
+
+    def overlaps(self, source, start, end):
+        """Returns the list of the :class:`SourceUsage` of the given reel or
+        source file that use any of its ``[start, end)`` frames.
+        """
+        start, end = self._frames(start), self._frames(end)
+        starts, segments = self._get_segments(source)
+        i = max(bisect.bisect_right(starts, start) - 1, 0)
+        found = []
+        for seg_start, seg_end, usages in segments[i:]:
+            if seg_start >= end:
+                break
+            if seg_end <= start:
+                continue
+            found.extend(u for u in usages if u.start < end and u.end > start)
+        return found
+
+    def save(self, path):
+        """Writes the index to the given JSON file.
+        """
+        with open(path, 'w') as f:
+            json.dump({'edls': self._edls}, f)
+
+    @classmethod
+    def load(cls, path):
+        """Returns the index saved to the given JSON file.
+        """
+        with open(path) as f:
+            data = json.load(f)
+        index = cls()
+        for name, records in data['edls'].items():
+            index._add_records(name, [tuple(r) for r in records])
+        return index
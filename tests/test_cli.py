@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+from edl import Parser
+from edl import cli
+
+
+class CLITestCase(unittest.TestCase):
+    """tests the edl.cli module
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def parse(self, path='../tests/test_data/test_24.edl'):
+        with open(path) as f:
+            return Parser('24').parse(f)
+
+    def test_find_edls_expands_directories_and_globs(self):
+        """testing if find_edls() expands directories and glob patterns
+        """
+        from_dir = cli.find_edls(['../tests/test_data'])
+        from_glob = cli.find_edls(['../tests/test_data/test_2*.edl'])
+
+        self.assertEqual(11, len(from_dir))
+        self.assertEqual(7, len(from_glob))
+        self.assertTrue(set(from_glob) < set(from_dir))
+
+    def test_find_edls_raises_for_missing_files(self):
+        """testing if find_edls() raises an IOError for missing paths
+        """
+        self.assertRaises(IOError, cli.find_edls, ['../tests/missing.edl'])
+
+    def test_stats(self):
+        """testing if stats() reports the event count and length
+        """
+        s = cli.stats(self.parse())
+        self.assertEqual(11, s['events'])
+        self.assertEqual(3862, s['length'])
+        self.assertEqual('00:02:40:22', s['duration'])
+        self.assertEqual(['AA', 'V'], s['tracks'])
+
+    def test_capture_list_merges_ranges(self):
+        """testing if capture_list() merges the ranges of each reel
+        """
+        captures = cli.capture_list(self.parse(), handles=0)
+        self.assertEqual([('AX', 1, 2161), ('AX', 86401, 87841)], captures)
+
+    def test_convert_keeps_frames_for_same_nominal_rate(self):
+        """testing if converting from 24 to 23.98 keeps the frame numbers
+        """
+        s = self.parse()
+        converted = cli.convert(s, '23.98')
+        self.assertEqual(len(s), len(converted))
+        self.assertEqual([e.rec_end_tc.frames for e in s],
+                         [e.rec_end_tc.frames for e in converted])
+
+    def test_convert_scales_frames(self):
+        """testing if converting from 24 to 48 doubles the frame numbers
+        """
+        s = self.parse()
+        converted = cli.convert(s, '48')
+        self.assertEqual(s[0].rec_length() * 2, converted[0].rec_length())
+        self.assertEqual(str(s[0].rec_end_tc), str(converted[0].rec_end_tc))
+
+    def test_convert_scales_transitions_and_timewarps(self):
+        """testing if converting scales the transition durations and the
+        timewarp speeds
+        """
+        s = self.parse('../tests/test_data/test.edl')
+        converted = cli.convert(s, '48')
+        dissolve = converted[5]
+        self.assertEqual('D', dissolve.tr_code)
+        self.assertEqual('140', dissolve.aux)
+        self.assertEqual(140, dissolve.incoming_transition_duration())
+        self.assertEqual(140, converted[4].outgoing_transition_duration())
+        self.assertIs(converted[4], dissolve.prev_event)
+        wipe = converted[8]
+        self.assertEqual('W001', wipe.tr_code)
+        self.assertEqual('050', wipe.aux)
+        self.assertEqual(-50.0, converted[-1].timewarp.warp_fps)
+        self.assertTrue(converted[-1].reverse())
+        # the source EDL is not changed
+        self.assertEqual('070', s[5].aux)
+        self.assertEqual(70, s[5].incoming_transition_duration())
+        self.assertEqual(-25.0, s[-1].timewarp.warp_fps)
+
+    def test_main_export_jsonl(self):
+        """testing if the export command writes one JSON line per event
+        """
+        import json
+        output = os.path.join(self.tmp_dir, 'events.jsonl')
+        status = cli.main(['export', '-q', '-j', '2', '--fps', '24',
+                           '--format', 'jsonl', '-o', output,
+                           '../tests/test_data/test_24.edl',
+                           '../tests/test_data/test.edl'])
+        self.assertEqual(0, status)
+        with open(output) as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(24, len(rows))
+        self.assertEqual('clip 1', rows[0]['clip_name'])
+
+    def test_main_convert_keeps_the_input_tree(self):
+        """testing if the convert command writes EDLs with the same name from
+        different directories to different files
+        """
+        src = os.path.join(self.tmp_dir, 'src')
+        for name, edl in (('a', 'test_24.edl'), ('b', 'test.edl')):
+            os.makedirs(os.path.join(src, name))
+            shutil.copy(os.path.join('../tests/test_data', edl),
+                        os.path.join(src, name, 'reel.edl'))
+        output = os.path.join(self.tmp_dir, 'out')
+        status = cli.main(['convert', '-q', '-j', '1', '--fps', '24',
+                           '--to-fps', '48', '-o', output, src])
+        self.assertEqual(0, status)
+        with open(os.path.join(output, 'a', 'reel.edl')) as f:
+            a = f.read()
+        with open(os.path.join(output, 'b', 'reel.edl')) as f:
+            b = f.read()
+        self.assertNotEqual(a, b)
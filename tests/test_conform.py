@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+from edl import Parser, Catalog
+from edl.conform import MediaFile
+
+
+class CatalogTestCase(unittest.TestCase):
+    """tests the edl.conform.Catalog class
+    """
+
+    def setUp(self):
+        p = Parser('24')
+        with open('../tests/test_data/test_24.edl') as f:
+            self.edl = p.parse(f)
+
+    def test_full_partial_and_missing(self):
+        """testing if events are resolved to the media holding their source
+        """
+        catalog = Catalog([
+            # 01:00:00:00 - 01:01:00:00, the whole source of event 001
+            MediaFile('clip 1', 'A001', 86400, 1440, '24'),
+            # only the first 10 seconds of event 003
+            ('clip -3', None, 0, 240, '24'),
+            {'name': 'other', 'reel': 'AX', 'start': 0, 'length': 2400,
+             'fps': '23.976'},
+        ])
+        report = catalog.conform(self.edl)
+        by_num = dict((m.event.num, m) for m in report)
+
+        self.assertEqual('full', by_num['001'].status)
+        self.assertEqual('clip_name', by_num['001'].key)
+        self.assertFalse(by_num['001'].fps_mismatch)
+
+        self.assertEqual('partial', by_num['003'].status)
+        self.assertEqual(240, by_num['003'].coverage)
+
+        # no media for the clip name, found by reel
+        self.assertEqual('reel', by_num['002'].key)
+        self.assertEqual('other', by_num['002'].media.name)
+        self.assertTrue(by_num['002'].fps_mismatch)
+
+        summary = report.summary()
+        self.assertEqual(len(report), summary['events'])
+        self.assertEqual(len(report.missing()), summary['missing'])
+        self.assertEqual(summary['events'], summary['full'] +
+                         summary['partial'] + summary['missing'])
+
+    def test_other_frame_rates_are_converted(self):
+        """testing if media at another frame rate are compared in time
+        """
+        # 01:00:00:00 at 25 fps holds the source of event 001 at 24 fps
+        catalog = Catalog([MediaFile('clip 1', None, 90000, 1500, '25')])
+        match = catalog.conform(self.edl).matches[0]
+        self.assertEqual('full', match.status)
+        self.assertTrue(match.fps_mismatch)
+
+    def test_best_overlap_wins(self):
+        """testing if the media covering most of the event is picked
+        """
+        catalog = Catalog([MediaFile('v1', 'AX', 86400, 100, '24'),
+                           MediaFile('v2', 'AX', 86300, 1700, '24'),
+                           MediaFile('v3', 'AX', 90000, 100, '24')])
+        match = catalog.conform(self.edl).matches[0]
+        self.assertEqual('v2', match.media.name)
+        self.assertEqual(1440, match.coverage)
+
+    def test_from_csv(self):
+        """testing if a catalog can be read from a CSV file
+        """
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, 'media.csv')
+            with open(path, 'w') as f:
+                f.write('name,reel,start,length,fps\n'
+                        'clip 1,A001,01:00:00:00,1440,24\n'
+                        'clip #2,,0,2160,24\n')
+            catalog = Catalog.from_csv(path)
+        finally:
+            shutil.rmtree(tmp_dir)
+        self.assertEqual(2, len(catalog))
+        report = catalog.conform(self.edl)
+        self.assertEqual(['full', 'full'],
+                         [m.status for m in report.matches[:2]])
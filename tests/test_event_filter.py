@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from edl import Parser, EventFilter
+
+
+class EventFilterTestCase(unittest.TestCase):
+    """tests the edl.filters.EventFilter class
+    """
+
+    def parse(self, event_filter):
+        p = Parser('24', filter=event_filter)
+        with open('../tests/test_data/test.edl') as f:
+            return p.parse(f)
+
+    def test_no_filter_keeps_every_event(self):
+        """testing if all the events are parsed without a filter
+        """
+        s = self.parse(None)
+        self.assertEqual(13, len(s))
+
+    def test_tracks_filter(self):
+        """testing if only the events on the given tracks are kept
+        """
+        s = self.parse(EventFilter(tracks='AA'))
+        self.assertEqual(['002', '006', '007', '007', '011'],
+                         [e.num for e in s])
+        self.assertEqual('Sequence 01', s.title)
+
+    def test_reels_filter(self):
+        """testing if only the events of the given reels are kept and the
+        trailing lines of the rejected events are skipped
+        """
+        s = self.parse(EventFilter(reels=['BL']))
+        self.assertEqual(1, len(s))
+        self.assertEqual('007', s[0].num)
+        self.assertEqual('Constant Power', s[0].transition.effect)
+        self.assertEqual(('* TO CLIP NAME: BL',), s[0].comments)
+        self.assertFalse(s[0].has_timewarp())
+
+    def test_rec_range_filter(self):
+        """testing if only the events overlapping the record range are kept
+        """
+        s = self.parse(EventFilter(rec_range=('00:02:06:10', '00:02:10:21')))
+        self.assertEqual(['007', '009'], [e.num for e in s])
+
+    def test_callable_filter(self):
+        """testing if a plain callable can be used as a filter
+        """
+        s = self.parse(lambda fields: fields['tr_code'] != 'C')
+        self.assertEqual(['005', '007'], [e.num for e in s])
+        self.assertEqual(('* TO CLIP NAME: Jellyfish.jpg',), s[0].comments)
+
+    def test_next_event_links_kept_events(self):
+        """testing if events are linked to the next kept event of their track
+        """
+        s = self.parse(EventFilter(reels=['AX']))
+        nums = [e.num for e in s]
+        i = nums.index('007')
+        self.assertEqual('011', s[i].next_event.num)
+        self.assertIs(s[nums.index('009')], s[nums.index('008')].next_event)
+
+    def test_filter_shared_between_frame_rates(self):
+        """testing if a filter given to parsers of different frame rates is
+        converted for each of them
+        """
+        event_filter = EventFilter(rec_range=('00:00:10:00', '00:00:20:00'))
+        p24 = Parser('24', filter=event_filter)
+        p25 = Parser('25', filter=event_filter)
+        self.assertEqual(241, p24.filter._rec_start)
+        self.assertEqual(251, p25.filter._rec_start)
+        self.assertIsNone(event_filter._rec_start)
+
+    def test_long_frame_numbers(self):
+        """testing if the record range can be given as long integers
+        """
+        s = self.parse(EventFilter(rec_range=(3035L, 3142L)))
+        self.assertEqual(['007', '009'], [e.num for e in s])
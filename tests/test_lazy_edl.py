@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+import tempfile
+import unittest
+from edl import Parser, EventFilter
+
+
+class LazyEDLTestCase(unittest.TestCase):
+    """tests the edl.edl.LazyEDL class
+    """
+
+    def setUp(self):
+        with open('../tests/test_data/test.edl') as f:
+            self.lines = f.readlines()
+        self.expected = Parser('24').parse(self.lines)
+
+    def test_len_and_title_after_indexing(self):
+        """testing if len() and the title are available after indexing
+        """
+        l = Parser('24').parse_lazy(self.lines)
+        self.assertEqual(len(self.expected), len(l))
+        self.assertEqual('Sequence 01', l.title)
+        self.assertEqual(0, len(l._cache))
+
+    def test_events_match_the_parser(self):
+        """testing if the lazily built events match the parsed ones
+        """
+        l = Parser('24').parse_lazy(''.join(self.lines))
+        for expected, actual in zip(self.expected, l):
+            self.assertEqual(expected.to_string(), actual.to_string())
+            self.assertEqual(expected.clip_name, actual.clip_name)
+        self.assertEqual(self.expected.to_string(), l.to_string())
+        self.assertEqual(self.expected.get_length(), l.get_length())
+
+    def test_indexing_and_slicing(self):
+        """testing if events can be reached by negative indices and slices
+        """
+        l = Parser('24').parse_lazy(self.lines)
+        self.assertEqual(self.expected[-1].to_string(), l[-1].to_string())
+        self.assertEqual([e.num for e in self.expected[2:8:3]],
+                         [e.num for e in l[2:8:3]])
+        self.assertRaises(IndexError, l.__getitem__, len(l))
+
+    def test_cache(self):
+        """testing if only cache_size events are kept and reused
+        """
+        l = Parser('24').parse_lazy(self.lines, cache_size=2)
+        first = l[0]
+        self.assertIs(first, l[0])
+        l[1]
+        l[2]
+        self.assertEqual([1, 2], list(l._cache))
+        self.assertIsNot(first, l[0])
+
+    def test_filter(self):
+        """testing if the parser filter is applied while indexing
+        """
+        p = Parser('24', filter=EventFilter(tracks='AA'))
+        l = p.parse_lazy(self.lines)
+        self.assertEqual(['002', '006', '007', '007', '011'],
+                         [e.num for e in l])
+        self.assertEqual('Constant Power', l[3].transition.effect)
+
+    def test_read_only(self):
+        """testing if events can not be appended
+        """
+        l = Parser('24').parse_lazy(self.lines)
+        self.assertRaises(TypeError, l.append, None)
+
+    def test_no_cache(self):
+        """testing if a cache_size of 0 builds the events on each access
+        """
+        l = Parser('24').parse_lazy(self.lines, cache_size=0)
+        first = l[0]
+        self.assertEqual(self.expected[0].to_string(), first.to_string())
+        self.assertIsNot(first, l[0])
+        self.assertEqual(0, len(l._cache))
+
+    def test_file_is_read_back(self):
+        """testing if the events of a file are read back from it by offset
+        """
+        with tempfile.TemporaryFile() as f:
+            f.writelines(self.lines)
+            f.seek(0)
+            l = Parser('24').parse_lazy(f)
+            self.assertIsNone(l._lines)
+            self.assertEqual(len(self.expected), len(l))
+            self.assertEqual('Sequence 01', l.title)
+            self.assertEqual(self.expected[-1].to_string(), l[-1].to_string())
+            self.assertEqual(self.expected.to_string(), l.to_string())
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+import unittest
+from edl import Parser, EventFilter
+
+
+class ParallelParseTestCase(unittest.TestCase):
+    """tests the edl.edl.Parser.parse_parallel() method
+    """
+
+    def setUp(self):
+        with open('../tests/test_data/test.edl') as f:
+            lines = f.readlines()
+        # the title line and the events repeated, the title is changed in the
+        # middle of the list
+        self.lines = lines[:1] + lines[1:] * 20 + \
+            ['TITLE: Sequence 02\n'] + lines[1:] * 20
+
+    def assertSameEDL(self, expected, actual):
+        self.assertEqual(expected.title, actual.title)
+        self.assertEqual(len(expected), len(actual))
+        self.assertEqual(expected.to_string(), actual.to_string())
+        for e, a in zip(expected, actual):
+            self.assertEqual(e.clip_name, a.clip_name)
+            self.assertEqual(e.comments, a.comments)
+            self.assertEqual(e.reverse(), a.reverse())
+            self.assertEqual(e.outgoing_transition_duration(),
+                             a.outgoing_transition_duration())
+            self.assertEqual(e.next_event is None, a.next_event is None)
+            if e.next_event is not None:
+                self.assertEqual(e.next_event.edl_index,
+                                 a.next_event.edl_index)
+
+    def test_split_chunks_at_event_lines(self):
+        """testing if the chunks start on event lines and keep every line
+        """
+        p = Parser('24')
+        chunks = p._split_chunks(self.lines, 8)
+        self.assertEqual(self.lines, [l for c in chunks for l in c])
+        for chunk in chunks[1:]:
+            self.assertIsNotNone(p._event_matcher.split(chunk[0]))
+
+    def test_same_result_as_parse(self):
+        """testing if parse_parallel() returns the same EDL as parse()
+        """
+        p = Parser('24')
+        expected = p.parse(self.lines)
+        actual = p.parse_parallel(self.lines, jobs=2, min_chunk_lines=50)
+        self.assertEqual('Sequence 02', actual.title)
+        self.assertSameEDL(expected, actual)
+        self.assertIs(actual[0].reel, actual[-1].reel)
+
+    def test_same_result_with_filter_and_pool(self):
+        """testing if a filter and an existing pool can be used
+        """
+        p = Parser('24', filter=EventFilter(tracks='AA'))
+        pool = multiprocessing.Pool(2)
+        try:
+            actual = p.parse_parallel(''.join(self.lines), pool=pool,
+                                      jobs=2, min_chunk_lines=50)
+        finally:
+            pool.close()
+            pool.join()
+        self.assertSameEDL(p.parse(self.lines), actual)
+
+    def test_small_input_is_parsed_serially(self):
+        """testing if inputs shorter than two chunks are parsed in process
+        """
+        p = Parser('24')
+        actual = p.parse_parallel(self.lines, jobs=2)
+        self.assertSameEDL(p.parse(self.lines), actual)
+
+    def test_packed_events(self):
+        """testing if the events built from the worker results behave like
+        parsed events
+        """
+        from edl.event import Event
+        p = Parser('24')
+        expected = p.parse(self.lines)
+        actual = p.parse_parallel(self.lines, jobs=2, min_chunk_lines=50)
+        e = actual[3]
+        self.assertIsInstance(e, Event)
+        self.assertEqual(expected[3].rec_start_tc.frames,
+                         e.transition_overlap()[0])
+        copied = e.copy_properties_to(Event({}))
+        self.assertEqual(str(expected[3].src_end_tc), str(copied.src_end_tc))
+        self.assertEqual(expected[3].rec_length(), copied.rec_length())
+        self.assertNotIn('_frames', copied.__dict__)
+
+    def test_packed_events_are_pickled_as_events(self):
+        """testing if pickling or copying an event does not send the frames
+        of its whole chunk
+        """
+        import copy
+        import pickle
+        from edl.event import Event
+        p = Parser('24')
+        expected = p.parse(self.lines)
+        actual = p.parse_parallel(self.lines, jobs=2, min_chunk_lines=50)
+        for protocol in (0, 2):
+            e = pickle.loads(pickle.dumps(actual[3], protocol))
+            self.assertIs(Event, type(e))
+            self.assertNotIn('_frames', e.__dict__)
+            self.assertEqual(expected[3].to_string(), e.to_string())
+        e = copy.copy(actual[3])
+        self.assertIs(Event, type(e))
+        self.assertEqual(expected[3].to_string(), e.to_string())
+        self.assertLess(len(pickle.dumps(actual[3], 2)),
+                        len(pickle.dumps(actual[3]._frames, 2)))
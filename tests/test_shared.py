@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+import pickle
+import unittest
+from edl import Parser
+from edl.shared import export_shared, attach_shared
+
+
+def _clip_name(args):
+    shared, i = args
+    return shared[i].clip_name
+
+
+class SharedEDLTestCase(unittest.TestCase):
+    """tests the edl.shared module
+    """
+
+    def setUp(self):
+        p = Parser('24')
+        with open('../tests/test_data/test.edl') as f:
+            self.edl = p.parse(f)
+        self.shared = export_shared(self.edl)
+
+    def tearDown(self):
+        self.shared.close()
+        self.shared.unlink()
+
+    def test_view_matches_the_edl(self):
+        """testing if an attached view holds the same events as the EDL
+        """
+        view = attach_shared(self.shared.name)
+        try:
+            self.assertEqual(len(self.edl), len(view))
+            self.assertEqual(self.edl.title, view.title)
+            self.assertEqual(self.edl.fps, view.fps)
+            self.assertEqual(self.edl.to_string(), view.to_string())
+            for expected, actual in zip(self.edl, view):
+                self.assertEqual(expected.clip_name, actual.clip_name)
+                self.assertEqual(expected.comments, actual.comments)
+                self.assertEqual(expected.get_metadata(),
+                                 actual.get_metadata())
+                self.assertEqual(expected.reverse(), actual.reverse())
+        finally:
+            view.close()
+
+    def test_plain_value_accessors(self):
+        """testing if the frames and reel can be read without an Event
+        """
+        e = self.edl[-1]
+        self.assertEqual((e.rec_start_tc.frames, e.rec_end_tc.frames),
+                         self.shared.rec_range(-1))
+        self.assertEqual((e.src_start_tc.frames, e.src_end_tc.frames),
+                         self.shared.src_range(-1))
+        self.assertEqual('BL', self.shared.reel(8))
+        self.assertRaises(IndexError, self.shared.reel, len(self.edl))
+
+    def test_pickled_as_the_block_name(self):
+        """testing if pickling a view does not copy the events
+        """
+        data = pickle.dumps(self.shared, 2)
+        self.assertNotIn('Jellyfish', data)
+        view = pickle.loads(data)
+        try:
+            self.assertEqual(self.shared.name, view.name)
+            self.assertRaises(ValueError, view.unlink)
+        finally:
+            view.close()
+
+    def test_worker_processes(self):
+        """testing if worker processes can read the shared EDL
+        """
+        pool = multiprocessing.Pool(2)
+        try:
+            names = pool.map(_clip_name,
+                             [(self.shared, i) for i in range(len(self.edl))])
+        finally:
+            pool.close()
+            pool.join()
+        self.assertEqual([e.clip_name for e in self.edl], names)
+
+    def test_read_only(self):
+        """testing if events can not be appended
+        """
+        self.assertRaises(TypeError, self.shared.append, None)
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from edl import Parser, SymbolTable
+
+
+class SymbolTableTestCase(unittest.TestCase):
+    """tests the edl.symbols.SymbolTable class
+    """
+
+    def parse(self, path, symbols=None):
+        p = Parser('24', symbols=symbols)
+        with open(path) as f:
+            return p.parse(f)
+
+    def test_intern_returns_the_shared_copy(self):
+        """testing if intern() returns the first registered copy of a value
+        """
+        symbols = SymbolTable()
+        first = ''.join(['clip ', 'name'])
+        second = ''.join(['clip ', 'name'])
+        self.assertIsNot(first, second)
+        self.assertIs(first, symbols.intern(first))
+        self.assertIs(first, symbols.intern(second))
+        self.assertIsNone(symbols.intern(None))
+        self.assertEqual(1, len(symbols))
+        self.assertIn('clip name', symbols)
+
+    def test_strings_are_shared_within_an_edl(self):
+        """testing if the repeated strings of an EDL are shared
+        """
+        s = self.parse('../tests/test_data/test.edl')
+        self.assertIsNotNone(s.symbols)
+        self.assertEqual('Test rename', s[2].clip_name)
+        self.assertIs(s[2].clip_name, s[3].clip_name)
+        self.assertIs(s[2].reel, s[3].reel)
+        self.assertIs(s[0].track, s[2].track)
+
+    def test_strings_are_shared_between_edls(self):
+        """testing if a SymbolTable can be shared between parses
+        """
+        symbols = SymbolTable()
+        a = self.parse('../tests/test_data/test.edl', symbols)
+        b = self.parse('../tests/test_data/test_50.edl', symbols)
+        self.assertIs(symbols, a.symbols)
+        self.assertIs(a[2].clip_name, b[2].clip_name)
+        self.assertIs(a[5].comments[0], b[5].comments[0])
+
+    def test_comment_metadata(self):
+        """testing if "* KEY: value" comments are gathered as metadata
+        """
+        s = self.parse('../tests/test_data/test.edl')
+        self.assertEqual({'FROM CLIP NAME': 'Test rename',
+                          'TO CLIP NAME': 'Jellyfish.jpg'},
+                         s[5].get_metadata())
+        self.assertEqual({'FROM CLIP NAME': 'Jellyfish.jpg'},
+                         s[0].get_metadata())
+
+    def test_comment_metadata_is_extracted_once(self):
+        """testing if the "* KEY: value" pairs are extracted while parsing
+        and interned
+        """
+        symbols = SymbolTable()
+        a = self.parse('../tests/test_data/test.edl', symbols)
+        b = self.parse('../tests/test_data/test_50.edl', symbols)
+        self.assertEqual((('TO CLIP NAME', 'Jellyfish.jpg'),), a[5].metadata)
+        self.assertIs(a[5].metadata[0][1], b[5].metadata[0][1])
+        self.assertIs(a[0].metadata, a[1].metadata)
+
+    def test_comments_are_compact(self):
+        """testing if comments are stored as tuples, the events without
+        comments sharing the empty one, and if event numbers are not
+        interned
+        """
+        s = self.parse('../tests/test_data/test.edl')
+        self.assertEqual(('* TO CLIP NAME: Jellyfish.jpg',), s[5].comments)
+        self.assertIs(s[0].comments, s[1].comments)
+        self.assertEqual((), s[0].comments)
+        self.assertNotIn(s[0].num, s.symbols)
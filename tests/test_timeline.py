@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+import random
+import unittest
+import timecode
+from edl import Parser, Timeline
+from edl.timeline import Track
+from edl.event import Event
+
+
+class TimelineTestCase(unittest.TestCase):
+    """tests the edl.timeline.Timeline class
+    """
+
+    def setUp(self):
+        p = Parser('24')
+        with open('../tests/test_data/test.edl') as f:
+            self.edl = p.parse(f)
+        self.timeline = Timeline(self.edl)
+
+    def ranges(self, edl, track):
+        return [(e.num, e.rec_start_tc.frames, e.rec_end_tc.frames)
+                for e in edl if e.track == track]
+
+    def slate(self, frames):
+        e = Event({'num': '000', 'reel': 'SLATE', 'track': 'V',
+                   'tr_code': 'C', 'aux': ''})
+        e.src_start_tc = timecode.Timecode('24', frames=1)
+        e.src_end_tc = timecode.Timecode('24', frames=1 + frames)
+        return e
+
+    def test_round_trip(self):
+        """testing if the timeline gives back the same record ranges
+        """
+        out = self.timeline.to_edl()
+        self.assertEqual(['V', 'AA'], self.timeline.tracks())
+        self.assertEqual(len(self.edl), len(out))
+        for track in ('V', 'AA'):
+            self.assertEqual(self.ranges(self.edl, track),
+                             self.ranges(out, track))
+        dissolve = [e for e in out if e.tr_code == 'D'][0]
+        self.assertEqual(70, dissolve.incoming_transition_duration())
+        self.assertEqual(70, dissolve.prev_event.outgoing_transition_duration())
+
+    def test_ripple_insert(self):
+        """testing if inserting a clip pushes the later clips
+        """
+        v = self.timeline.track('V')
+        before = [v.rec_range(i) for i in range(len(v))]
+        v.insert(0, self.slate(48))
+        self.assertEqual((1, 49), v.rec_range(0))
+        self.assertEqual([(a + 48, b + 48) for a, b in before],
+                         [v.rec_range(i) for i in range(1, len(v))])
+        out = self.timeline.to_edl()
+        self.assertEqual('SLATE', out[0].reel)
+        # other tracks are not touched
+        self.assertEqual(self.ranges(self.edl, 'AA'), self.ranges(out, 'AA'))
+
+    def test_ripple_delete_keeps_gaps(self):
+        """testing if deleting a clip pulls the later clips and keeps the
+        gaps
+        """
+        v = self.timeline.track('V')
+        length = v.event(0).rec_length()
+        first = v.rec_range(1)
+        self.assertEqual('001', v.delete(0).num)
+        self.assertEqual((first[0] - length, first[1] - length),
+                         v.rec_range(0))
+
+        v.insert(len(v), self.slate(10))
+        self.assertEqual(10, v.rec_range(-1)[1] - v.rec_range(-1)[0])
+
+    def test_trim(self):
+        """testing if trimming moves the source and shifts the later clips
+        """
+        v = self.timeline.track('V')
+        src_start = v.event(0).src_start_tc.frames
+        second = v.rec_range(1)
+        e = v.trim(0, head=10, tail=5)
+        self.assertEqual(src_start + 10, e.src_start_tc.frames)
+        self.assertEqual(e.src_length(), v.rec_range(0)[1] - v.rec_range(0)[0])
+        self.assertEqual(second[0] - 15, v.rec_range(1)[0])
+        self.assertRaises(ValueError, v.trim, 0, head=100000)
+        self.assertEqual(second[0] - 15, v.rec_range(1)[0])
+
+    def test_move(self):
+        """testing if moving a clip ripples the clips between
+        """
+        v = self.timeline.track('V')
+        nums = [v.event(i).num for i in range(len(v))]
+        v.move(0, 2)
+        self.assertEqual(nums[1:3] + nums[:1] + nums[3:],
+                         [v.event(i).num for i in range(len(v))])
+
+    def test_index_at(self):
+        """testing if clips can be found by record frame
+        """
+        v = self.timeline.track('V')
+        start, end = v.rec_range(2)
+        self.assertEqual(2, v.index_at(start))
+        self.assertEqual(2, v.index_at(end - 1))
+        self.assertIsNone(v.index_at(v.start + v.duration + 10))
+
+    def test_many_edits(self):
+        """testing if many edits keep the track consistent
+        """
+        v = self.timeline.track('V')
+        for i in range(500):
+            v.insert(i % (len(v) + 1), self.slate(i % 7 + 1))
+        for i in range(250):
+            v.delete(i % len(v))
+        position = v.start
+        for i, (e, start, end) in enumerate(v.clips()):
+            self.assertEqual((start, end), v.rec_range(i))
+            self.assertTrue(start >= position)
+            position = end
+
+    def check_track(self, track):
+        clips = list(track.clips())
+        self.assertEqual([(start, end) for e, start, end in clips],
+                         [track.rec_range(i) for i in range(len(track))])
+        end = track.start
+        for i, (e, start, clip_end) in enumerate(clips):
+            for frame in (end, start - 1):
+                if end <= frame < start:
+                    self.assertIsNone(track.index_at(frame))
+            self.assertEqual(i, track.index_at(start))
+            self.assertEqual(i, track.index_at(clip_end - 1))
+            end = clip_end
+        self.assertEqual(end - track.start, track.duration)
+        self.assertIsNone(track.index_at(end))
+
+    def test_edits_with_gaps(self):
+        """testing if the record ranges stay right through random edits of a
+        track with gaps between its clips
+        """
+        def clip():
+            e = self.slate(10)
+            # leave room in front of the source to extend the clip head
+            e.src_start_tc = timecode.Timecode('24', frames=1001)
+            e.src_end_tc = timecode.Timecode('24', frames=1011)
+            return e
+
+        for seed in range(20):
+            random.seed(seed)
+            track = Track('V', '24', start=0)
+            for i in range(3):
+                track.append(clip(), length=10, gap=5)
+            track.insert(1, clip(), length=10)
+            self.assertEqual((30, 40), track.rec_range(2))
+            self.assertEqual(55, track.duration)
+            self.assertIsNone(track.index_at(40))
+            self.check_track(track)
+
+            for i in range(50):
+                track.append(clip(), length=random.randint(1, 20),
+                             gap=random.randint(0, 10))
+            for i in range(200):
+                op = random.choice(['insert', 'delete', 'trim', 'move'])
+                n = len(track)
+                if op == 'insert':
+                    track.insert(random.randint(0, n), clip(),
+                                 length=random.randint(1, 20))
+                elif op == 'delete' and n > 1:
+                    track.delete(random.randrange(n))
+                elif op == 'trim':
+                    track.trim(random.randrange(n), head=-random.randint(0, 3),
+                               tail=-random.randint(0, 3))
+                elif op == 'move':
+                    track.move(random.randrange(n), random.randrange(n))
+            self.check_track(track)
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+import copy
+import pickle
+import unittest
+from edl import Parser, EDL
+from edl.event import Event
+from edl.effects import Dissolve
+
+
+class TransitionsTestCase(unittest.TestCase):
+    """tests the edl.transitions.Transitions class
+    """
+
+    def setUp(self):
+        p = Parser('24')
+        with open('../tests/test_data/test.edl') as f:
+            self.edl = p.parse(f)
+
+    def test_events_are_linked_on_their_track(self):
+        """testing if the events are linked to their neighbours on the same
+        track whatever their transition
+        """
+        s = self.edl
+        # 005 C (V) is followed by the 005 D dissolve on the same track
+        self.assertIs(s[5], s[4].next_event)
+        self.assertIs(s[4], s[5].prev_event)
+        # 002 (AA) is followed by 006 (AA) over the video events
+        self.assertIs(s[6], s[1].next_event)
+        self.assertIsNone(s[0].prev_event)
+        self.assertIsNone(s[-1].next_event)
+
+    def test_transition_durations(self):
+        """testing if the incoming and outgoing durations are resolved
+        """
+        s = self.edl
+        self.assertEqual(70, s[5].incoming_transition_duration())
+        self.assertEqual(70, s[4].outgoing_transition_duration())
+        self.assertTrue(s[4].ends_with_transition())
+        self.assertEqual(70, s[4].rec_length_with_transition())
+        self.assertEqual(25, s[7].outgoing_transition_duration())
+        self.assertEqual(0, s[0].outgoing_transition_duration())
+        self.assertFalse(s[0].ends_with_transition())
+
+    def test_overlaps(self):
+        """testing if the A/B overlap ranges are computed
+        """
+        s = self.edl
+        start = s[5].rec_start_tc.frames
+        self.assertEqual((start, start + 70), s[5].transition_overlap())
+        start = s[0].rec_start_tc.frames
+        self.assertEqual((start, start), s[0].transition_overlap())
+
+    def test_arrays(self):
+        """testing if the transitions are available as arrays on the EDL
+        """
+        t = self.edl.transitions
+        self.assertEqual(len(self.edl), len(t))
+        self.assertEqual([5, 8], t.with_transition())
+        self.assertEqual(95, t.total_overlap())
+        self.assertEqual(5, t.next[4])
+        self.assertEqual(-1, t.previous[0])
+
+    def test_unresolved_events(self):
+        """testing if events outside of a resolved EDL still compute their
+        transitions
+        """
+        e = Event({'aux': '012', 'tr_code': 'D'})
+        e.transition = Dissolve()
+        self.assertEqual(12, e.incoming_transition_duration())
+        l = EDL('24')
+        l.append(e)
+        self.assertIsNone(l.transitions)
+
+    def test_pickle_large_edl(self):
+        """testing if an EDL of several hundred events can be pickled and
+        is resolved again when unpickled
+        """
+        with open('../tests/test_data/test_24.edl') as f:
+            lines = f.readlines()
+        edl = Parser('24').parse(lines[:1] + lines[1:] * 50)
+        self.assertEqual(550, len(edl))
+        for protocol in (0, 2):
+            copied = pickle.loads(pickle.dumps(edl, protocol))
+            self.assertEqual(edl.to_string(), copied.to_string())
+            self.assertIsNotNone(copied.transitions)
+            self.assertIs(copied[2], copied[0].next_event)
+            self.assertEqual(list(edl.transitions.outgoing),
+                             list(copied.transitions.outgoing))
+
+    def test_copy_events(self):
+        """testing if events can be deep copied and their copies are not
+        linked to the EDL
+        """
+        with open('../tests/test_data/test.edl') as f:
+            lines = f.readlines()
+        edl = Parser('24').parse(lines[:1] + lines[1:] * 200)
+        e = copy.deepcopy(edl[4])
+        self.assertEqual(edl[4].to_string(), e.to_string())
+        self.assertIsNone(e.next_event)
+        self.assertIsNone(e.transition_table)
+        self.assertEqual(70, copy.copy(edl[5]).incoming_transition_duration())
+
+    def test_append_drops_resolved_transitions(self):
+        """testing if appended events do not keep the transitions of another
+        EDL
+        """
+        sub = EDL('24')
+        for e in self.edl:
+            if e.tr_code != 'D':
+                sub.append(e)
+        self.assertEqual(0, sub[4].outgoing_transition_duration())
+        self.assertFalse(sub[4].ends_with_transition())
+        sub.resolve_transitions()
+        self.assertEqual(0, sub[4].outgoing_transition_duration())
+        self.assertEqual([7], sub.transitions.with_transition())
+
+        # appending to a resolved EDL
+        sub.append(self.edl[5])
+        self.assertIsNone(sub.transitions)
+        self.assertIsNone(sub[0].transition_table)
+        self.assertIsNone(sub[0].next_event)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+from edl import Parser, SourceUsageIndex
+
+
+class SourceUsageIndexTestCase(unittest.TestCase):
+    """tests the edl.usage.SourceUsageIndex class
+    """
+
+    def setUp(self):
+        p = Parser('24')
+        with open('../tests/test_data/test_24.edl') as f:
+            self.edl_24 = p.parse(f)
+        with open('../tests/test_data/test.edl') as f:
+            self.edl = p.parse(f)
+        self.index = SourceUsageIndex()
+        self.index.add('test_24', self.edl_24)
+        self.index.add('test', self.edl)
+
+    def test_used_ranges_are_merged(self):
+        """testing if the used ranges of a reel are merged and tagged
+        """
+        ranges = self.index.used_ranges('AX')
+        self.assertEqual([(1, 2161), (86374, 87841)],
+                         [(start, end) for start, end, usages in ranges])
+        self.assertEqual(set(['test', 'test_24']),
+                         set(u.edl for u in ranges[1][2]))
+        self.assertEqual(['AX'], self.index.sources())
+
+    def test_contains(self):
+        """testing if contains() checks the whole range is used
+        """
+        self.assertTrue(self.index.contains('AX', 1, 2161))
+        self.assertTrue(self.index.contains('AX', 86374, 86500))
+        self.assertFalse(self.index.contains('AX', 2000, 2200))
+        self.assertFalse(self.index.contains('AX', 0, 10))
+        self.assertFalse(self.index.contains('A001', 1, 2))
+        # misses are not cached
+        self.assertNotIn('A001', self.index._segments)
+
+    def test_overlaps(self):
+        """testing if overlaps() returns the usages of the given frames
+        """
+        start = self.edl[0].src_start_tc
+        usages = self.index.overlaps('AX', start, start.frames + 1)
+        self.assertEqual([('test', '001'), ('test', '005'), ('test', '008'),
+                          ('test_24', '001'), ('test_24', '007')],
+                         sorted((u.edl, u.num) for u in usages))
+        self.assertEqual([], self.index.overlaps('AX', 2161, 86374))
+
+    def test_remove(self):
+        """testing if removing an EDL removes its usages only
+        """
+        self.index.remove('test')
+        self.assertNotIn('test', self.index)
+        self.assertEqual(['test_24'], self.index.edls())
+        usages = self.index.overlaps('AX', 1, 100000)
+        self.assertEqual(set(['test_24']), set(u.edl for u in usages))
+
+    def test_add_replaces_an_edl(self):
+        """testing if adding an EDL again replaces its usages
+        """
+        before = len(self.index.overlaps('AX', 1, 100000))
+        self.index.add('test', self.edl)
+        self.assertEqual(before, len(self.index.overlaps('AX', 1, 100000)))
+
+    def test_save_and_load(self):
+        """testing if an index can be saved and loaded back
+        """
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, 'index.json')
+            self.index.save(path)
+            loaded = SourceUsageIndex.load(path)
+        finally:
+            shutil.rmtree(tmp_dir)
+        self.assertEqual(self.index.edls(), loaded.edls())
+        self.assertEqual(self.index.used_ranges('AX'),
+                         loaded.used_ranges('AX'))